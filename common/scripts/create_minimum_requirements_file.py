@@ -4,18 +4,19 @@ import argparse
 from typing import List, Dict
 
 
-def get_installed_versions() -> Dict[str, str]:
+def get_dependency_tree() -> List[Dict]:
+    """Return the installed package dependency tree reported by pipdeptree."""
+    result = subprocess.run(["pipdeptree", "--json"], stdout=subprocess.PIPE, check=True, text=True)
+    return json.loads(result.stdout)
+
+
+def get_installed_versions(tree: List[Dict]) -> Dict[str, str]:
     """Return a mapping of package name to its installed version."""
-    result = subprocess.run(["pip", "list", "--format=json"], stdout=subprocess.PIPE, check=True, text=True)
-    pkgs = json.loads(result.stdout)
-    return {pkg["name"].lower(): pkg["version"] for pkg in pkgs}
+    return {pkg["package"]["key"]: pkg["package"]["installed_version"] for pkg in tree}
 
 
-def get_top_level_packages() -> List[str]:
+def get_top_level_packages(tree: List[Dict]) -> List[str]:
     """Return a sorted list of top-level packages (not dependencies of any other package)."""
-    result = subprocess.run(["pipdeptree", "--json"], stdout=subprocess.PIPE, check=True, text=True)
-    tree = json.loads(result.stdout)
-
     all_packages = {pkg["package"]["key"] for pkg in tree}
     all_dependencies = {dep["key"] for pkg in tree for dep in pkg.get("dependencies", [])}
 
@@ -41,8 +42,10 @@ def main():
     )
     args = parser.parse_args()
 
-    top_level = get_top_level_packages()
-    versions = get_installed_versions() if args.with_versions else {}
+    # pipdeptree already reports installed versions, so one subprocess serves both lookups
+    tree = get_dependency_tree()
+    top_level = get_top_level_packages(tree)
+    versions = get_installed_versions(tree) if args.with_versions else {}
     write_requirements(top_level, versions, args.with_versions, args.output)
 
 
@@ -1,25 +1,40 @@
 # IMPORTS
 # typing libraries
-from typing import List, Dict, Tuple
+from typing import Any, List, Dict, Iterable, Optional, Tuple, AsyncIterator
+
+# caching libraries
+from functools import lru_cache
 
 # file management libraries
 import os
 import io
-import json
+import uuid
+import orjson
 
 # Azure Data Lake libraries
-from azure.storage.filedatalake import DataLakeServiceClient, FileSystemClient
+from azure.storage.filedatalake import DataLakeServiceClient, FileSystemClient, DataLakeFileClient
 from azure.identity import AzureCliCredential
+from azure.core.credentials import AccessToken
 from azure.core.exceptions import ResourceNotFoundError
 
-# multithreading libraries
+# asynchronous Azure Data Lake libraries
+from azure.storage.filedatalake.aio import FileSystemClient as AsyncFileSystemClient
+from azure.identity.aio import AzureCliCredential as AsyncAzureCliCredential
+
+# multithreading and asynchronous I/O libraries
 import concurrent.futures as cf
+import threading
+import asyncio
+import time
 
 # data manipulation libraries
 import pandas as pd
+import pyarrow as pa
+import pyarrow.json as pa_json
+import pyarrow.parquet as pq
 
 # progress bar library
-from tqdm import tqdm
+from tqdm.asyncio import tqdm_asyncio
 
 
 # LOAD ENVIRONMENT VARIABLES
@@ -31,6 +46,26 @@ env_path = Path(__file__).resolve().parent.parent / ".env"
 load_dotenv(dotenv_path=env_path, override=False)
 
 
+# transfers move in 8 MiB blocks (the 1-4 MiB SDK defaults are CPU-bound on large files); frames larger than the
+# threshold are streamed to the data lake instead of being serialized into a single in-memory buffer first
+TRANSFER_CHUNK_SIZE = 8 * 1024 * 1024
+STREAMING_UPLOAD_THRESHOLD = 1024 * 1024 * 1024
+
+# large parquet files are downloaded as this many concurrent range requests, and uploaded as this many
+# concurrently staged blocks
+DOWNLOAD_MAX_CONCURRENCY = 8
+UPLOAD_MAX_CONCURRENCY = 8
+
+# uploads are bandwidth-bound, so trade a little CPU for smaller files: zstd compresses noticeably tighter
+# than pyarrow's snappy default at similar speed, and dictionary encoding shrinks repeated strings
+PARQUET_WRITE_OPTIONS = {
+    "compression": "zstd",
+    "compression_level": 3,
+    "use_dictionary": True,
+    "row_group_size": 128 * 1024,
+}
+
+
 # delegating to each module to simplify __init__.py
 __all__ = [
     "get_azure_service_client",
@@ -39,14 +74,140 @@ __all__ = [
     "save_df_as_parquet_in_data_lake",
     "convert_json_to_parquet",
     "get_transactions_and_line_items",
+    "save_transactions_and_line_items",
 ]
 
 
+# cached Azure CLI tokens are refreshed this many seconds before they expire
+TOKEN_REFRESH_MARGIN = 300
+
+
+# CLASSES
+class CachedAzureCliCredential:
+    """
+    Azure CLI credential that keeps access tokens in memory until they are close to expiring.
+
+    `AzureCliCredential` runs `az account get-access-token` in a subprocess for every token request.
+    This wrapper returns the last token issued for the same scopes until it is within
+    `TOKEN_REFRESH_MARGIN` seconds of expiry, and only then asks the Azure CLI for a new one.
+    """
+
+    def __init__(self):
+        self._credential = AzureCliCredential()
+        self._tokens = {}
+        self._lock = threading.Lock()
+
+    def get_token(self, *scopes: str, **kwargs) -> AccessToken:
+        key = (scopes, kwargs.get("tenant_id"))
+
+        with self._lock:
+            token = self._tokens.get(key)
+            if token is None or token.expires_on - time.time() <= TOKEN_REFRESH_MARGIN:
+                token = self._credential.get_token(*scopes, **kwargs)
+                self._tokens[key] = token
+
+        return token
+
+    def close(self) -> None:
+        self._credential.close()
+
+
+class DataLakeAppendStream(io.RawIOBase):
+    """
+    Write-only file-like object that stages written bytes to a Data Lake file in fixed-size blocks.
+
+    Bytes are buffered until `chunk_size` is reached and then appended on a background thread, so the writer keeps
+    serializing while earlier blocks upload. Appends carry explicit offsets, so up to `max_concurrency` of them can be
+    in flight at once (which also bounds the memory held in staged blocks).
+
+    The blocks are appended to a temporary file next to the target, which `commit` flushes and renames onto the
+    target, so readers keep seeing the previous file until the new one is complete. Use the stream as a context
+    manager: it commits if the block succeeds, and otherwise `abort`s, deleting the temporary file.
+    """
+
+    def __init__(self, file_system_client: FileSystemClient, file_path: str, chunk_size: int = TRANSFER_CHUNK_SIZE,
+                 max_concurrency: int = UPLOAD_MAX_CONCURRENCY):
+        super().__init__()
+        self._target_name = f"{file_system_client.file_system_name}/{file_path}"
+        self._file_client = file_system_client.get_file_client(f"{file_path}.tmp-{uuid.uuid4().hex}")
+        self._chunk_size = chunk_size
+        self._max_concurrency = max_concurrency
+        self._buffer = bytearray()
+        self._offset = 0
+        self._executor = cf.ThreadPoolExecutor(max_workers=max_concurrency)
+        self._pending = []
+
+        # appends start from a new, empty temporary file; the target is untouched until commit
+        self._file_client.create_file()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        if exc_type is None:
+            try:
+                self.commit()
+            except BaseException:
+                self.abort()
+                raise
+        else:
+            self.abort()
+        self.close()
+        return False
+
+    def writable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._offset + len(self._buffer)
+
+    def write(self, data) -> int:
+        self._buffer += data
+        if len(self._buffer) >= self._chunk_size:
+            self._stage_buffer()
+        return len(data)
+
+    def _stage_buffer(self) -> None:
+        if self._buffer:
+            # wait for the oldest block before staging another once the limit is reached (re-raising its error)
+            if len(self._pending) >= self._max_concurrency:
+                self._pending.pop(0).result()
+
+            block = bytes(self._buffer)
+            self._pending.append(self._executor.submit(self._file_client.append_data, block, offset=self._offset,
+                                                       length=len(block)))
+            self._offset += len(block)
+            self._buffer.clear()
+
+    def commit(self) -> None:
+        """Append any remaining bytes, wait for all blocks, flush the file and rename it onto the target."""
+        try:
+            self._stage_buffer()
+            for future in self._pending:
+                future.result()
+        finally:
+            self._executor.shutdown(wait=True)
+        self._file_client.flush_data(self._offset)
+        self._file_client.rename_file(self._target_name)
+
+    def abort(self) -> None:
+        """Drop any blocks not yet uploaded and delete the temporary file, leaving the target as it was."""
+        self._buffer.clear()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        try:
+            self._file_client.delete_file()
+        except ResourceNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Error deleting temporary file {self._file_client.path_name}: {e}")
+
+
 # FUNCTIONS
+@lru_cache(maxsize=8)
 def get_azure_service_client(storage_url_env_var: str) -> DataLakeServiceClient:
     """
     Get an Azure Data Lake Service Client using Azure CLI credentials.
 
+    Clients are cached per environment variable, so repeated calls reuse the same credential
+    and connection pool instead of re-authenticating through the Azure CLI.
+
     Args:
         storage_url_env_var (str): name of environment variable that holds URL of the Azure Storage Account
 
@@ -57,19 +218,24 @@ def get_azure_service_client(storage_url_env_var: str) -> DataLakeServiceClient:
     # load environment variables
     AZURE_STORAGE_BLOB_URL = os.getenv(storage_url_env_var)
 
-    # Authenticate using Azure CLI credentials
-    credential = AzureCliCredential()
+    # Authenticate using Azure CLI credentials, reusing tokens instead of calling the CLI per request
+    credential = CachedAzureCliCredential()
 
-    # Create the service client
-    service_client = DataLakeServiceClient(account_url=AZURE_STORAGE_BLOB_URL, credential=credential)
+    # Create the service client; files past the first block are downloaded as 8 MiB range requests
+    service_client = DataLakeServiceClient(account_url=AZURE_STORAGE_BLOB_URL, credential=credential,
+                                           max_single_get_size=TRANSFER_CHUNK_SIZE,
+                                           max_chunk_get_size=TRANSFER_CHUNK_SIZE)
 
     return service_client
 
 
+@lru_cache(maxsize=32)
 def get_azure_file_system_client(service_client: DataLakeServiceClient, file_system_name: str) -> FileSystemClient:
     """
     Get an Azure Data Lake File System Client.
 
+    Clients are cached per (service client, file system name) pair.
+
     Args:
         service_client: DataLakeServiceClient
         file_system_name: str
@@ -84,72 +250,205 @@ def get_azure_file_system_client(service_client: DataLakeServiceClient, file_sys
     return file_system_client
 
 
-def read_file_from_data_lake(file_system_client: FileSystemClient, file_path: str) -> pd.DataFrame:
-    """Read a single file from Azure Data Lake Gen2 into a DataFrame.
+def read_file_from_data_lake(file_system_client: FileSystemClient, file_path: str) -> List[dict]:
+    """Read a single JSON file from Azure Data Lake Gen2 into a list of records.
 
     Args:
         file_system_client (FileSystemClient): The client to access the file system.
         file_path (str): The path of the file to read.
 
     Returns:
-        pd.DataFrame: A DataFrame containing the data from the file.
+        List[dict]: The records in the file, or an empty list if the file could not be read.
     """
     try:
         file_client = file_system_client.get_file_client(file_path)
         download = file_client.download_file()
-        record = json.loads(download.readall().decode('utf-8'))
-
-        # top level files have only one record
-        # line item files have a list of records
-        if isinstance(record, list):
-            df = pd.DataFrame(record)  # line df
-        else:
-            df = pd.DataFrame([record])  # top level record
+        record = orjson.loads(download.readall())
 
     except Exception as e:
-        # Handle errors gracefully and return an empty DataFrame
+        # Handle errors gracefully and return no records
         print(f"Error reading file {file_path}: {e}")
-        df = pd.DataFrame()
+        return []
+
+    # top level files have only one record
+    # line item files have a list of records
+    return record if isinstance(record, list) else [record]
+
+
+def _without_timestamps(data_type: pa.DataType) -> pa.DataType:
+    """Replace the timestamp types that pyarrow infers from ISO-formatted JSON strings with strings."""
+    if pa.types.is_timestamp(data_type):
+        return pa.string()
+    if pa.types.is_struct(data_type):
+        return pa.struct([field.with_type(_without_timestamps(field.type)) for field in data_type])
+    if pa.types.is_list(data_type):
+        return pa.list_(data_type.value_field.with_type(_without_timestamps(data_type.value_type)))
+    return data_type
+
+
+def _records_to_table(records: List[dict]) -> pa.Table:
+    """Convert JSON records to an Arrow table by parsing them as newline-delimited JSON.
+
+    pyarrow's JSON reader parses and builds the columns in C across multiple threads, which is much faster
+    than building a DataFrame from Python dicts. Dates are kept as the strings they were in the source,
+    as they would be in a DataFrame built from the records.
+
+    Args:
+        records (List[dict]): The records to convert.
+
+    Returns:
+        pa.Table: A table with one row per record.
+
+    Raises:
+        pa.ArrowInvalid: If the records cannot be tabulated, e.g. a field mixes numbers and strings.
+    """
+    ndjson = b"\n".join(orjson.dumps(record) for record in records)
+    table = pa_json.read_json(pa.BufferReader(ndjson))
+
+    schema = pa.schema([field.with_type(_without_timestamps(field.type)) for field in table.schema])
+    if not schema.equals(table.schema):
+        table = pa_json.read_json(pa.BufferReader(ndjson), parse_options=pa_json.ParseOptions(explicit_schema=schema))
+
+    return table
+
+
+async def _read_json_records(file_system_client: AsyncFileSystemClient, file_path: str,
+                             semaphore: asyncio.Semaphore) -> List[dict]:
+    """Download a single JSON file from Azure Data Lake Gen2 and return its records.
+
+    Args:
+        file_system_client (AsyncFileSystemClient): The async client to access the file system.
+        file_path (str): The path of the file to read.
+        semaphore (asyncio.Semaphore): Bounds the number of downloads in flight.
+
+    Returns:
+        List[dict]: The records in the file, or an empty list if the file could not be read.
+    """
+    async with semaphore:
+        try:
+            download = await file_system_client.get_file_client(file_path).download_file()
+            record = orjson.loads(await download.readall())
+
+        except Exception as e:
+            # Handle errors gracefully and skip the file
+            print(f"Error reading file {file_path}: {e}")
+            return []
+
+    # top level files have only one record
+    # line item files have a list of records
+    return record if isinstance(record, list) else [record]
+
+
+async def _iter_json_record_batches(file_system_client: FileSystemClient, source_dir: str, file_names: List[str],
+                                    max_workers: int, batch_size: int = None) -> AsyncIterator[List[dict]]:
+    """Download JSON files concurrently using an async client on the same file system and yield their records.
+
+    Args:
+        file_system_client (FileSystemClient): The (sync) client whose account and file system are read.
+        source_dir (str): The directory to read files from.
+        file_names (List[str]): The list of file paths to read.
+        max_workers (int): Maximum number of downloads in flight.
+        batch_size (int, optional): Yield records as soon as at least this many have been downloaded.
+            Defaults to None, which yields all records in a single batch.
+
+    Yields:
+        List[dict]: The next batch of records, in download completion order.
+    """
+    records = []
+    credential = AsyncAzureCliCredential()
+    account_url = f"{file_system_client.scheme}://{file_system_client.primary_hostname}"
+
+    async with credential, AsyncFileSystemClient(account_url, file_system_client.file_system_name,
+                                                 credential=credential) as async_client:
+        # schedule every file at once; the semaphore keeps max_workers downloads in flight without
+        # draining at batch boundaries (~30+ concurrent requests are needed to saturate blob throughput)
+        semaphore = asyncio.Semaphore(max_workers)
+        tasks = [_read_json_records(async_client, f"{source_dir}/{file}", semaphore) for file in file_names]
+
+        # let tqdm own the completion loop; it only redraws every `mininterval` seconds instead of per file
+        for task in tqdm_asyncio.as_completed(tasks, total=len(tasks), desc=f"Processing {source_dir} Files",
+                                              mininterval=0.5):
+            records.extend(await task)
+
+            if batch_size and len(records) >= batch_size:
+                yield records
+                records = []
+
+    if records:
+        yield records
+
+
+async def _gather_json_records(file_system_client: FileSystemClient, source_dir: str, file_names: List[str],
+                               max_workers: int) -> List[dict]:
+    """Download JSON files concurrently and collect their records into a single list.
+
+    Args:
+        file_system_client (FileSystemClient): The (sync) client whose account and file system are read.
+        source_dir (str): The directory to read files from.
+        file_names (List[str]): The list of file paths to read.
+        max_workers (int): Maximum number of downloads in flight.
+
+    Returns:
+        List[dict]: The records from all files.
+    """
+    records = []
+    async for batch in _iter_json_record_batches(file_system_client, source_dir, file_names, max_workers):
+        records.extend(batch)
 
-    return df
+    return records
+
+
+async def _gather_json_tables(file_system_client: FileSystemClient, source_dir: str, file_names: List[str],
+                              max_workers: int, batch_size: int) -> List[pa.Table]:
+    """Download JSON files concurrently and convert their records to Arrow tables one batch at a time.
+
+    Only one batch of records is held as Python objects at once; everything downloaded so far is kept
+    in columnar form.
+
+    Args:
+        file_system_client (FileSystemClient): The (sync) client whose account and file system are read.
+        source_dir (str): The directory to read files from.
+        file_names (List[str]): The list of file paths to read.
+        max_workers (int): Maximum number of downloads in flight.
+        batch_size (int): Number of records converted to each table.
+
+    Returns:
+        List[pa.Table]: One table per batch of records.
+    """
+    tables = []
+    async for batch in _iter_json_record_batches(file_system_client, source_dir, file_names, max_workers,
+                                                 batch_size):
+        try:
+            tables.append(_records_to_table(batch))
+        except pa.ArrowInvalid:
+            tables.append(pa.Table.from_pandas(pd.DataFrame.from_records(batch), preserve_index=False))
+
+    return tables
 
 
 def read_files_in_batches_from_data_lake(file_system_client: FileSystemClient, source_dir: str, file_names: List[str],
-                                         batch_size: int = 1000, max_workers: int = 15) -> pd.DataFrame:
-    """Read multiple files from Azure Data Lake Gen2 into a single DataFrame using multithreading with batching.
+                                         max_workers: int = 64) -> pd.DataFrame:
+    """Read multiple files from Azure Data Lake Gen2 into a single DataFrame using concurrent async downloads.
 
     Args:
         file_system_client (FileSystemClient): The client to access the file system.
         source_dir (str): The directory to read files from.
         file_names (List[str]): The list of file paths to read.
-        batch_size (int, optional): Number of files to read in each batch. Defaults to 1000.
-        max_workers (int, optional): Maximum number of worker threads. Defaults to 15.
+        max_workers (int, optional): Maximum number of concurrent downloads. Defaults to 64.
 
     Returns:
         pd.DataFrame: A DataFrame containing the data from all files.
     """
-    dataframes = []
-
-    with tqdm(total=len(file_names), desc=f"Processing {source_dir} Files") as progress_bar:
-        for i in range(0, len(file_names), batch_size):
-            batch_files = file_names[i:i + batch_size]
-
-            with cf.ThreadPoolExecutor(max_workers=max_workers) as executor:
-                # Submit tasks to the executor
-                futures = [executor.submit(read_file_from_data_lake, file_system_client, f"{source_dir}/{file}") for
-                           file in batch_files]
-
-                # Process results as they complete
-                for future in cf.as_completed(futures):
-                    df = future.result()
-                    if not df.empty:
-                        dataframes.append(df)
-                    progress_bar.update(1)
-
-    if dataframes:
-        final_df = pd.concat(dataframes, ignore_index=True)
+    records = asyncio.run(_gather_json_records(file_system_client, source_dir, file_names, max_workers))
+
+    # build a single DataFrame rather than concatenating one per file
+    if records:
+        try:
+            final_df = _records_to_table(records).to_pandas()
+        except pa.ArrowInvalid:
+            final_df = pd.DataFrame.from_records(records)
     else:
-        print("No dataframes to concatenate")
+        print("No records to load")
         final_df = pd.DataFrame()
 
     return final_df
@@ -159,44 +458,44 @@ def get_paths_by_directory(
         file_system_client: FileSystemClient,
         start_directory: str = "/",
         extension: str = ".json",
-        max_workers: int = 15
+        max_workers: int = 32
 ) -> Dict[str, List[str]]:
     """
     Filters paths in a file system client based on a given file extension and organizes
     them into a dictionary with directories as keys and files as values.
 
+    The immediate children of `start_directory` are listed first, and each subdirectory
+    is then listed recursively in parallel, since the listing itself is the slow part.
+
     Args:
         file_system_client (FileSystemClient): The file system client.
         start_directory (str): The directory to start searching from (default is '/').
         extension (str): The file extension to filter on (default is '.json').
-        max_workers (int): The maximum number of worker threads to use (default is 10).
+        max_workers (int): The maximum number of directories to list concurrently (default is 32).
 
     Returns:
         Dict[str, List[str]]: A dictionary where keys are directories/subdirectories
                               and values are lists of files with the specified extension.
     """
-    paths = file_system_client.get_paths(path=start_directory)
+    top_level_paths = list(file_system_client.get_paths(path=start_directory, recursive=False))
+    sub_directories = [path_item.name for path_item in top_level_paths if path_item.is_directory]
 
-    def is_target_file(path_item):
-        if path_item.name.endswith(extension):
-            # Extract directory and filename
-            *dirs, filename = path_item.name.split("/")
-            directory = "/".join(dirs)
-            return directory, filename
-        return None
+    def list_directory(directory: str) -> list:
+        return list(file_system_client.get_paths(path=directory, recursive=True))
 
-    # Use ThreadPoolExecutor for parallel filtering
+    # list each subdirectory tree in parallel
     with cf.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        filtered = list(executor.map(is_target_file, paths))
+        sub_directory_paths = list(executor.map(list_directory, sub_directories))
+
+    paths = top_level_paths + [path_item for listing in sub_directory_paths for path_item in listing]
 
     # Organize into a dictionary
     directory_to_files = {}
-    for result in filtered:
-        if result:
-            directory, filename = result
-            if directory not in directory_to_files:
-                directory_to_files[directory] = []
-            directory_to_files[directory].append(filename)
+    for path_item in paths:
+        if path_item.name.endswith(extension):
+            # Extract directory and filename
+            *dirs, filename = path_item.name.split("/")
+            directory_to_files.setdefault("/".join(dirs), []).append(filename)
 
     return directory_to_files
 
@@ -217,26 +516,37 @@ def save_df_as_parquet_in_data_lake(df: pd.DataFrame, file_system_client, azure_
         None
     """
 
+    # Define the path where you want to save the Parquet file in data lake
+    parquet_target_path = f"{azure_directory_path}/{file_name}"
+
+    # Stream very large DataFrames to the data lake in staged blocks so the full file is never held in memory
+    # (deep=True counts the actual string data, not just 8 bytes per object pointer)
+    if df.memory_usage(index=preserve_index, deep=True).sum() > STREAMING_UPLOAD_THRESHOLD:
+        with DataLakeAppendStream(file_system_client, parquet_target_path) as parquet_stream:
+            df.to_parquet(parquet_stream, engine='pyarrow', index=preserve_index, **PARQUET_WRITE_OPTIONS)
+        return
+
+    # Get a File Client for the Parquet file
+    parquet_file_client = file_system_client.get_file_client(parquet_target_path)
+
     # Create a BytesIO buffer
     parquet_buffer = io.BytesIO()
 
     # Write DataFrame to the buffer in Parquet format
-    df.to_parquet(parquet_buffer, engine='pyarrow', index=preserve_index)
+    df.to_parquet(parquet_buffer, engine='pyarrow', index=preserve_index, **PARQUET_WRITE_OPTIONS)
 
-    # Reset the buffer's position to the beginning
+    # Upload straight from the buffer (rather than a copy made with read()) in 8 MiB chunks
+    parquet_length = parquet_buffer.tell()
     parquet_buffer.seek(0)
-
-    # Define the path where you want to save the Parquet file in data lake
-    parquet_target_path = os.path.join(azure_directory_path, file_name)
-
-    # Get a File Client for the Parquet file
-    parquet_file_client = file_system_client.get_file_client(parquet_target_path)
-
-    # Upload the buffer's content to data lake
-    parquet_file_client.upload_data(parquet_buffer.read(), overwrite=True)
+    parquet_file_client.upload_data(parquet_buffer, length=parquet_length, overwrite=True,
+                                    chunk_size=TRANSFER_CHUNK_SIZE, max_concurrency=UPLOAD_MAX_CONCURRENCY)
 
 
-def get_parquet_file_from_data_lake(file_system_client, azure_directory_path: str, file_name: str) -> pd.DataFrame:
+def get_parquet_file_from_data_lake(file_system_client, azure_directory_path: str, file_name: str,
+                                    filters: Optional[List[Tuple[str, str, Any]]] = None,
+                                    columns: Optional[List[str]] = None,
+                                    exclude_columns: Optional[Iterable[str]] = None,
+                                    read_dictionary: Optional[List[str]] = None) -> pd.DataFrame:
     """
     Get a Parquet file from the Data Lake.
 
@@ -244,33 +554,47 @@ def get_parquet_file_from_data_lake(file_system_client, azure_directory_path: st
         file_system_client: DataLakeFileSystemClient
         azure_directory_path (str): path to the directory in the Data Lake
         file_name (str): name of the Parquet file
+        filters (list, optional): row filters in pyarrow's (column, op, value) form, e.g.
+            [("created_date", ">=", pd.Timestamp("2022-01-01"))]. They are applied while the file is read, so row
+            groups whose statistics fall outside the filters are skipped without being decoded. Defaults to None.
+        columns (list, optional): the only columns to read; the others are never decoded. Defaults to None (all).
+        exclude_columns (iterable, optional): columns not to read, e.g. those a cleaner drops anyway. Defaults to None.
+        read_dictionary (list, optional): low-cardinality string columns to read dictionary-encoded, so they arrive
+            as categoricals and comparisons run on their integer codes. Defaults to None.
 
     Returns:
         df (pd.DataFrame): DataFrame containing the Parquet file's data
     """
 
     # Define the path to the Parquet file in data lake
-    parquet_target_path = os.path.join(azure_directory_path, file_name)
+    parquet_target_path = f"{azure_directory_path}/{file_name}"
 
     # Get a File Client for the Parquet file
     parquet_file_client = file_system_client.get_file_client(parquet_target_path)
 
-    # Download the Parquet file into a BytesIO buffer
-    download = parquet_file_client.download_file()
+    # Download the Parquet file, fetching the byte ranges of large files in parallel
+    download = parquet_file_client.download_file(max_concurrency=DOWNLOAD_MAX_CONCURRENCY)
 
-    # Create an in-memory bytes buffer
+    # Read the downloaded bytes in place (no BytesIO copy) into an Arrow table
     parquet_bytes = download.readall()
-    parquet_buffer = io.BytesIO(parquet_bytes)
+    if exclude_columns:
+        # only the footer is parsed to list the file's columns
+        exclude_columns = set(exclude_columns)
+        names = columns or pq.read_schema(pa.BufferReader(parquet_bytes)).names
+        columns = [name for name in names if name not in exclude_columns]
+    table = pq.read_table(pa.BufferReader(parquet_bytes), use_pandas_metadata=True, filters=filters, columns=columns,
+                          read_dictionary=read_dictionary)
 
-    # Read the Parquet file from the buffer into a DataFrame
-    return pd.read_parquet(parquet_buffer, engine='pyarrow')
+    # Convert to a DataFrame, releasing each Arrow column as soon as it has been converted
+    return table.to_pandas(split_blocks=True, self_destruct=True)
 
 
 def convert_json_to_parquet(service_client: DataLakeServiceClient,
                             source_container_name: str,
                             source_directory: str,
                             target_container_name: str = "consolidated",
-                            target_directory: str = "raw") -> None:
+                            target_directory: str = "raw",
+                            batch_size: int = 50_000) -> None:
     """
     Converts JSON files in a single directory in the source container to Parquet files in target directory in the target container.
 
@@ -280,6 +604,7 @@ def convert_json_to_parquet(service_client: DataLakeServiceClient,
         source_directory (str): name of the source directory
         target_container_name (str): name of the target container (default is "consolidated")
         target_directory (str): name of the target directory (default is "raw")
+        batch_size (int): number of records converted to Arrow at a time (default is 50,000)
 
     Returns:
         None
@@ -290,10 +615,22 @@ def convert_json_to_parquet(service_client: DataLakeServiceClient,
 
     file_system_client = get_azure_file_system_client(service_client, source_container_name)
     file_paths = get_paths_by_directory(file_system_client, start_directory=source_directory)
-    df = read_files_in_batches_from_data_lake(file_system_client, source_directory, file_paths[source_directory])
+    tables = asyncio.run(_gather_json_tables(file_system_client, source_directory, file_paths[source_directory],
+                                             max_workers=64, batch_size=batch_size))
+    if not tables:
+        print(f"No records to convert in {source_directory}")
+        return
+
+    # fields missing from (or always null in) some batches are reconciled to a single schema
+    table = pa.concat_tables(tables, promote_options="permissive")
+    del tables
+
+    # stream the parquet file to the data lake in staged blocks instead of serializing it into memory first; the
+    # existing file is only replaced once the new one has been written in full
     file_system_client = get_azure_file_system_client(service_client, target_container_name)
-    save_df_as_parquet_in_data_lake(df, file_system_client, f"{target_directory}/{source_container_name}",
-                                    f"{source_directory}_{target_directory}.parquet")
+    parquet_target_path = f"{target_directory}/{source_container_name}/{source_directory}_{target_directory}.parquet"
+    with DataLakeAppendStream(file_system_client, parquet_target_path) as parquet_stream:
+        pq.write_table(table, parquet_stream, **PARQUET_WRITE_OPTIONS)
 
 
 def get_transactions_and_line_items(file_system_client: FileSystemClient,
@@ -321,20 +658,60 @@ def get_transactions_and_line_items(file_system_client: FileSystemClient,
 
     data_state = data_state.lower()
 
-    # transactions are cleaned but usually not enhanced, so, need to fall back to cleaned if not available
-    if data_state == "enhanced":
+    def submit_reads(executor: cf.ThreadPoolExecutor, state: str) -> Tuple[cf.Future, cf.Future]:
+        # transactions and line items are independent downloads, so fetch them concurrently
+        return (
+            executor.submit(get_parquet_file_from_data_lake, file_system_client, f"{state}/netsuite",
+                            f"transaction/{trans_type}_{state}.parquet"),
+            executor.submit(get_parquet_file_from_data_lake, file_system_client, f"{state}/netsuite",
+                            f"transaction/{trans_type}ItemLineItems_{state}.parquet"),
+        )
+
+    with cf.ThreadPoolExecutor(max_workers=2) as executor:
+        transactions_future, line_items_future = submit_reads(executor, data_state)
+
+        # transactions are cleaned but usually not enhanced, so, need to fall back to cleaned if not available
         try:
-            transactions = get_parquet_file_from_data_lake(file_system_client, f"{data_state}/netsuite",
-                                                           f"transaction/{trans_type}_{data_state}.parquet")
+            transactions = transactions_future.result()
         except ResourceNotFoundError:
-            data_state = "cleaned"
-            transactions = get_parquet_file_from_data_lake(file_system_client, f"{data_state}/netsuite",
-                                                           f"transaction/{trans_type}_{data_state}.parquet")
-    else:
-        transactions = get_parquet_file_from_data_lake(file_system_client, f"{data_state}/netsuite",
-                                                       f"transaction/{trans_type}_{data_state}.parquet")
+            if data_state != "enhanced":
+                raise
+            transactions_future, line_items_future = submit_reads(executor, "cleaned")
+            transactions = transactions_future.result()
 
-    line_items = get_parquet_file_from_data_lake(file_system_client, f"{data_state}/netsuite",
-                                                 f"transaction/{trans_type}ItemLineItems_{data_state}.parquet")
+        line_items = line_items_future.result()
 
     return transactions, line_items
+
+
+def save_transactions_and_line_items(transactions: pd.DataFrame, line_items: pd.DataFrame,
+                                     file_system_client: FileSystemClient, azure_directory_path: str,
+                                     trans_type: str, file_suffix: str) -> None:
+    """
+    Saves transactions and their line items as Parquet files in the Data Lake, uploading both at once.
+
+    Args:
+        transactions (pd.DataFrame): The transactions to save.
+        line_items (pd.DataFrame): The line items to save.
+        file_system_client (FileSystemClient): The client instance for interacting with the Azure Data Lake file system.
+        azure_directory_path (str): path to the directory in the Data Lake, e.g. "cleaned/netsuite"
+        trans_type (str): The transaction type, e.g. "SalesOrd".
+        file_suffix (str): The data state in the file names, e.g. "cleaned" for "transaction/SalesOrd_cleaned.parquet"
+            and "transaction/SalesOrdItemLineItems_cleaned.parquet".
+
+    Returns:
+        None
+    """
+
+    # the two uploads are independent, so overlap their round trips instead of waiting on each in turn
+    with cf.ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [
+            executor.submit(save_df_as_parquet_in_data_lake, transactions, file_system_client, azure_directory_path,
+                            f"transaction/{trans_type}_{file_suffix}.parquet"),
+            executor.submit(save_df_as_parquet_in_data_lake, line_items, file_system_client, azure_directory_path,
+                            f"transaction/{trans_type}ItemLineItems_{file_suffix}.parquet"),
+        ]
+
+        # re-raise the first failure, if any
+        for future in futures:
+            future.result()
@@ -3,7 +3,8 @@ This module provides shared functions for managing configuration.
 """
 
 ### IMPORTS ###
-import json
+import orjson
+from functools import lru_cache
 
 
 # delegating to each module to simplify __init__.py
@@ -15,15 +16,26 @@ __all__ = [
 ### FUNCTIONS ###
 from importlib import resources
 from pathlib import Path
-import json
 import types
 from typing import Union
 
+
+@lru_cache(maxsize=None)
+def _load_json(path: str, mtime: float) -> dict:
+    """
+    Parse a JSON file, cached on its path and modification time so an edited file is re-read.
+    """
+    return orjson.loads(Path(path).read_bytes())
+
+
 def load_config(source: Union[str, types.ModuleType], filename: str | None = None) -> dict:
     """
     Load a JSON config either from disk (when source is a path string)
     or from a Python package (when source is a module and filename is set).
 
+    Parsed configs are cached until the file changes, so repeated loads only cost a `stat`.
+    The returned dict is shared between callers and must not be modified.
+
     Args:
         source:
           - A filesystem path (str or Path) _or_
@@ -38,12 +50,10 @@ def load_config(source: Union[str, types.ModuleType], filename: str | None = Non
     # file-system path
     if isinstance(source, (str, Path)):
         p = Path(source)
-        with p.open("r") as f:
-            return json.load(f)
+        return _load_json(str(p.resolve()), p.stat().st_mtime)
 
     # package-resource
     if filename is None:
         raise ValueError("When loading from a package, `filename` must be provided")
     with resources.path(source, filename) as p:
-        with p.open("r") as f:
-            return json.load(f)
+        return _load_json(str(p.resolve()), p.stat().st_mtime)
@@ -4,17 +4,86 @@ This module provides data augmentation functions shared across the project.
 
 ### IMPORTS ###
 # data manipulation
-from pandas import DataFrame
+from pandas import DataFrame, CategoricalDtype
 
 
 # delegating to each module to simplify __init__.py
 __all__ = [
     "add_new_category_levels",
     "add_vsi_item_category",
+    "add_item_master_fields",
 ]
 
 
+### CONSTANTS ###
+LEVEL_COLUMNS = [f"level_{i}_category" for i in range(1, 7)]
+
+
 ### FUNCTIONS ###
+def _update_from_master(df: DataFrame, master: DataFrame, columns: list) -> DataFrame:
+    """
+    Overwrites `columns` in `df` with the non-null values in `master` for matching SKUs.
+
+    This is a vectorized equivalent of `df.set_index('sku').update(master.set_index('sku'))`: the master rows are
+    looked up once for all columns with a single hash-based reindex, and `sku` is kept as the leading column on a
+    fresh index, as `reset_index` would leave it.
+
+    Args:
+        df (DataFrame): The DataFrame to update. It must contain a 'sku' column and all of `columns`.
+        master (DataFrame): The reference DataFrame with a 'sku' column and all of `columns`.
+        columns (list): The columns to update.
+
+    Returns:
+        DataFrame: `df` with the matching values updated.
+    """
+    matches = master.drop_duplicates('sku').set_index('sku')[columns].reindex(df['sku'].to_numpy())
+    matches.index = df.index
+
+    for col in columns:
+        new_values = matches[col]
+
+        # categorical columns can only be assigned values that are already categories
+        if isinstance(df[col].dtype, CategoricalDtype):
+            df[col] = df[col].cat.set_categories(df[col].cat.categories.union(new_values.dropna().unique()))
+            new_values = new_values.astype(df[col].dtype)
+
+        df[col] = df[col].mask(new_values.notna(), new_values)
+
+    return df[['sku'] + [col for col in df.columns if col != 'sku']].reset_index(drop=True)
+
+
+def _add_level_columns(df: DataFrame) -> DataFrame:
+    """
+    Adds the "Not Specified" level 4-6 category columns directly after level_3_category.
+    """
+    # add new level columns to df
+    for i in [4, 5, 6]:
+        df[f"level_{i}_category"] = 'Not Specified'
+        df[f"level_{i}_category"] = df[f"level_{i}_category"].astype('string')
+
+    # rearrange the columns so that the levels are contiguous
+    columns_before = df.columns[0:df.columns.get_loc("level_3_category") + 1].tolist()
+    level_columns = [f"level_{i}_category" for i in range(4, 7)]
+    remaining_columns = [col for col in df.columns if col not in columns_before + level_columns]
+
+    return df[columns_before + level_columns + remaining_columns]
+
+
+def _finalize_level_columns(df: DataFrame) -> DataFrame:
+    """
+    Applies the level category fix-ups that follow the master lookup and returns the levels as strings.
+    """
+    # replace old category value with the updated one for those skus that didn't match
+    df["level_1_category"] = df["level_1_category"].replace("Valve", "Valves")
+
+    # the levels are persisted and grouped on downstream, so they are stored as strings even if they arrived as
+    # categoricals (which would change groupby results on pandas 2)
+    for col in LEVEL_COLUMNS:
+        df[col] = df[col].astype('string')
+
+    return df
+
+
 def add_new_category_levels(df: DataFrame, level_info: DataFrame) -> DataFrame:
     """
     Adds new category levels to an input DataFrame and updates matching category data
@@ -38,33 +107,13 @@ def add_new_category_levels(df: DataFrame, level_info: DataFrame) -> DataFrame:
         on the reference input.
     """
 
-    df = df.copy()
-
-    # add new level columns to df
-    for i in [4, 5, 6]:
-        df[f"level_{i}_category"] = 'Not Specified'
-        df[f"level_{i}_category"] = df[f"level_{i}_category"].astype('string')
-
-    # rearrange the columns so that the levels are contiguous
-    columns_before = df.columns[0:df.columns.get_loc("level_3_category") + 1].tolist()
-    level_columns = [f"level_{i}_category" for i in range(4, 7)]
-    remaining_columns = [col for col in df.columns if col not in columns_before + level_columns]
-    df = df[columns_before + level_columns + remaining_columns]
+    df = _add_level_columns(df)
 
     # Update level categories for matching df
-    # set sku as index for both df and level_info
-    level_columns = [f"level_{i}_category" for i in range(1, 7)]
-    df = df.set_index('sku')
-    master_lookup = level_info.set_index('sku')[level_columns]
+    # only SKUs present in level_info will overwrite
+    df = _update_from_master(df, level_info, LEVEL_COLUMNS)
 
-    # only SKUs present in master_lookup will overwrite
-    df.update(master_lookup)
-    df = df.reset_index()
-
-    # replace old category value with the updated one for those skus that didn't match
-    df["level_1_category"] = df["level_1_category"].replace("Valve", "Valves")
-
-    return df
+    return _finalize_level_columns(df)
 
 
 def add_vsi_item_category(df: DataFrame, item_master: DataFrame, new_col: str = 'vsi_item_category') -> DataFrame:
@@ -75,7 +124,8 @@ def add_vsi_item_category(df: DataFrame, item_master: DataFrame, new_col: str =
     This function creates a new column in the input DataFrame `df`, initializes it
     with a default value, and updates it based on a lookup with another DataFrame,
     `item_master`. The new column can be named as specified by the user, or it
-    will default to 'vsi_item_category'.
+    will default to 'vsi_item_category'. The new column is added to `df` in place, so
+    callers that need the original unchanged should pass a copy.
 
     Args:
         df (DataFrame): The input DataFrame. It must contain a column named 'sku'
@@ -91,18 +141,43 @@ def add_vsi_item_category(df: DataFrame, item_master: DataFrame, new_col: str =
         based on the provided `item_master`.
     """
 
-    df = df.copy()
-
     # add new column to df
     df[new_col] = 'Not Specified'
     df[new_col] = df[new_col].astype('string')
 
     # Update vsi_category for matching df
-    df = df.set_index('sku')
-    master_lookup = item_master.set_index('sku')[new_col]
-
-    # only SKUs present in master_lookup will overwrite
-    df.update(master_lookup)
-    df = df.reset_index()
+    # only SKUs present in item_master will overwrite
+    df = _update_from_master(df, item_master, [new_col])
 
     return df
+
+
+def add_item_master_fields(df: DataFrame, item_master: DataFrame, new_col: str = 'vsi_item_category') -> DataFrame:
+    """
+    Adds the category levels and the vsi item category from the item master to a DataFrame.
+
+    This produces the same result as `add_new_category_levels` followed by `add_vsi_item_category`
+    against the same item master, but looks up all of the item master fields for each SKU in a
+    single pass instead of one pass per function.
+
+    Args:
+        df (DataFrame): The input DataFrame. It must contain a 'sku' column and the level 1-3
+            category columns.
+        item_master (DataFrame): The reference DataFrame with a 'sku' column, the level 1-6
+            category columns, and `new_col`.
+        new_col (str): The name of the new column to add for item categorization.
+            Defaults to 'vsi_item_category'.
+
+    Returns:
+        DataFrame: A new DataFrame with the added category levels and item category.
+    """
+    df = _add_level_columns(df)
+
+    # add new column to df
+    df[new_col] = 'Not Specified'
+    df[new_col] = df[new_col].astype('string')
+
+    # only SKUs present in item_master will overwrite
+    df = _update_from_master(df, item_master, LEVEL_COLUMNS + [new_col])
+
+    return _finalize_level_columns(df)
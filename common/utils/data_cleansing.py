@@ -5,12 +5,16 @@ This module provides data cleansing/filtering functions shared across the projec
 ### IMPORTS ###
 # standard libraries
 import re
-import datetime
-from dateutil.relativedelta import relativedelta
+from typing import List
+from functools import lru_cache
 
 # data manipulation
+import numpy as np
 from numpy import where
-from pandas import DataFrame, Timestamp, to_datetime
+from pandas import DataFrame, Categorical, Timestamp, DateOffset, factorize
+from pandas.api.types import union_categoricals
+import pyarrow as pa
+import pyarrow.compute as pc
 
 # config
 import common.config
@@ -21,6 +25,7 @@ from common.utils.configuration_management import load_config
 __all__ = [
     "remove_illegal_chars",
     "clean_illegal_chars_in_column",
+    "get_columns_to_drop",
     "drop_dataframe_columns",
     "round_float_columns",
     "get_cutoff_date",
@@ -31,6 +36,22 @@ __all__ = [
 ]
 
 
+### CONSTANTS ###
+# ASCII control characters (range 0-31 and 127)
+ILLEGAL_CHARS_PATTERN = r'[\x00-\x1F\x7F]'
+_ILLEGAL_CHARS_RE = re.compile(ILLEGAL_CHARS_PATTERN)
+
+# runs of periods, commas and whitespace in manufacturer names collapse to a single space; the whitespace characters
+# are spelled out (the same set as Python's \s) because pyarrow's regex engine only treats ASCII whitespace as \s
+MANUFACTURER_SEPARATORS_PATTERN = "[,.\t\n\x0b\x0c\r\x1c-\x1f \x85\xa0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000]+"
+
+# item names containing the word "custom" are removed on clean
+_CUSTOM_ITEM_RE = re.compile(r'\bcustom\b', re.IGNORECASE)
+
+# the patterns used with .str.replace stay uncompiled on purpose: pandas sends compiled patterns through the
+# per-value Python path for pyarrow-backed strings, and caches compiled patterns for the Python path itself
+
+
 ### FUNCTIONS ###
 def remove_illegal_chars(value: str) -> str:
     """
@@ -47,7 +68,7 @@ def remove_illegal_chars(value: str) -> str:
         A new string with illegal ASCII control characters removed.
     """
     # Remove ASCII control characters (range 0-31 and 127)
-    return re.sub(r'[\x00-\x1F\x7F]', '', value)
+    return _ILLEGAL_CHARS_RE.sub('', value)
 
 
 def clean_illegal_chars_in_column(df: DataFrame, column: str) -> DataFrame:
@@ -61,20 +82,38 @@ def clean_illegal_chars_in_column(df: DataFrame, column: str) -> DataFrame:
     Returns:
         DataFrame: The DataFrame with the cleaned column.
     """
-    df = df.copy()
-    # Convert the column to string type if not already
-    df[column] = df[column].astype('string').apply(remove_illegal_chars)
+    # a shallow copy is enough since the column is replaced rather than modified in place
+    df = df.copy(deep=False)
+    # Convert the column to string type if not already and strip the characters in one vectorized pass
+    df[column] = df[column].astype('string').str.replace(ILLEGAL_CHARS_PATTERN, '', regex=True)
     return df
 
 
+@lru_cache(maxsize=None)
+def get_columns_to_drop(table_name: str) -> frozenset:
+    """
+    Returns the set of columns configured to be dropped from the given table when it is cleaned.
+
+    Readers can pass this set to skip decoding these columns, as long as cleaning does not use them before they are
+    dropped.
+
+    Args:
+        table_name (str): The name of the table in table_field_drops_on_clean.json.
+
+    Returns:
+        frozenset: The names of the columns to drop.
+    """
+    return frozenset(load_config(common.config, "table_field_drops_on_clean.json")[table_name])
+
+
 def drop_dataframe_columns(df: DataFrame, table_name: str) -> DataFrame:
     """
     Drops specified columns from the given DataFrame based on the configuration for the given table name.
 
     This function reads a configuration file (table_field_drops_on_clean.json) to determine
     the columns that should be dropped from the provided DataFrame for the specified table.
-    It modifies the original DataFrame in place by removing the columns listed for the given
-    table name.
+    Configured columns that are already absent (e.g., because they were not read from the
+    Parquet file) are skipped. The original DataFrame is left unchanged.
 
     Args:
         df (DataFrame): The DataFrame from which columns will be dropped.
@@ -84,11 +123,10 @@ def drop_dataframe_columns(df: DataFrame, table_name: str) -> DataFrame:
     Returns:
         DataFrame: The modified DataFrame with specified columns removed.
     """
-    df = df.copy()
-    drop_cols = load_config(common.config, "table_field_drops_on_clean.json")[table_name]
-    df.drop(drop_cols, axis=1, inplace=True)
+    drop_cols = get_columns_to_drop(table_name)
 
-    return df
+    # a positive projection only reindexes the kept columns
+    return df[[col for col in df.columns if col not in drop_cols]]
     
     
 def round_float_columns(df: DataFrame, decimals: int = 2) -> DataFrame:
@@ -102,9 +140,24 @@ def round_float_columns(df: DataFrame, decimals: int = 2) -> DataFrame:
     Returns:
         DataFrame: A new DataFrame with the float columns rounded.
     """
-    df = df.copy()  # Create a copy to avoid modifying a slice of the original DataFrame.
     float_cols = df.select_dtypes(include=["float"]).columns
-    df.loc[:, float_cols] = df.loc[:, float_cols].round(decimals)
+    if float_cols.empty:
+        return df
+
+    # a shallow copy avoids modifying the original DataFrame since the float columns are replaced, not written into
+    df = df.copy(deep=False)
+
+    # round all numpy float columns of the same dtype as one 2D array; nullable floats go through pandas
+    columns_by_dtype = {}
+    for col, dtype in df.dtypes[float_cols].items():
+        columns_by_dtype.setdefault(dtype, []).append(col)
+
+    for dtype, cols in columns_by_dtype.items():
+        if isinstance(dtype, np.dtype):
+            df[cols] = np.round(df[cols].to_numpy(), decimals)
+        else:
+            df[cols] = df[cols].round(decimals)
+
     return df
 
 
@@ -114,8 +167,8 @@ def get_cutoff_date(months: int = 12) -> Timestamp:
     of months in the past.
 
     This function computes a date by subtracting the specified number of months
-    from the current date, and then converts it to a pandas Timestamp. It uses
-    the relativedelta function to handle the calculation of past months.
+    from midnight of the current date. It uses pandas' DateOffset to handle the
+    calculation of past months, so the result is a pandas Timestamp directly.
 
     Args:
         months (int): The number of months to subtract from the current date. Defaults to 12.
@@ -123,61 +176,121 @@ def get_cutoff_date(months: int = 12) -> Timestamp:
     Returns:
         Timestamp: A pandas Timestamp object representing the calculated cutoff date.
     """
-    cutoff_date = datetime.date.today() - relativedelta(months=months)
-    return to_datetime(cutoff_date, errors="coerce")
+    return Timestamp.today().normalize() - DateOffset(months=months)
 
 
-def clean_and_resolve_manufacturers(df: DataFrame) -> DataFrame:
+@lru_cache(maxsize=1)
+def _get_manufacturer_corrections() -> dict:
     """
-    Cleans and resolves data in the "manufacturer" column of a DataFrame. Adjusts the values in the manufacturer column by
-    appropriately considering custom manufacturer values and predefined mappings for misspellings.
+    Builds a lookup from each misspelled manufacturer name to the name it is finally corrected to.
 
-    Args:
-        df (DataFrame): Input DataFrame containing a "manufacturer" column and related columns ("custom_manufacturer"
-            and "vsi_mfr") to resolve manufacturer data.
+    The manufacturer map lists misspellings per correct name, and the corrections are applied in file
+    order, so a name corrected by one entry can be corrected again by a later one (e.g. "agf" -> "agi" ->
+    "anderson greenwood"). Replaying the entries for each misspelling once here lets the whole column be
+    corrected with a single lookup. Call `_get_manufacturer_corrections.cache_clear()` after editing the map
+    in a running session.
 
     Returns:
-        DataFrame: The DataFrame with cleaned and resolved manufacturer data in the "manufacturer" column.
+        dict: Mapping of misspelled name to corrected name.
     """
+    mfg_name_map = [(correct_name, set(misspellings)) for correct_name, misspellings in
+                    load_config(common.config, "manufacturer_name_map.json")["manufacturer_map"].items()]
+
+    corrections = {}
+    for name in set().union(*(misspellings for _, misspellings in mfg_name_map)):
+        corrected = name
+        for correct_name, misspellings in mfg_name_map:
+            if corrected in misspellings:
+                corrected = correct_name
+        if corrected != name:
+            corrections[name] = corrected
+
+    return corrections
+
 
+def _clean_manufacturer_names(names: List[str]) -> List[str]:
+    """
+    Normalizes manufacturer names: fixes separators, spacing and misspellings, and recapitalizes each word.
+
+    All but the final recapitalization run as pyarrow compute kernels over a single Arrow array.
+    """
     # words that will not be recapitalized below
     do_not_capitalize = ["Not", "Inc", "Co"]
 
-    # Clean up manufacturer columns
-    for col in ["manufacturer", "custom_manufacturer", "vsi_mfr"]:
-        # replace None values
-        df[col] = df[col].fillna("Not Specified")
+    names = pa.array(names, type=pa.string())
 
-        # replace "Unknown" with "Not Specified" (only happens in vsi_mfr
-        df.loc[df[col] == "Unknown", col] = "Not Specified"
+    # replace "Unknown" with "Not Specified" (only happens in vsi_mfr
+    names = pc.if_else(pc.equal(names, "Unknown"), "Not Specified", names)
 
-        # -- remove periods and commas
-        df[col] = df[col].str.replace(r'[,.]', ' ', regex=True)
+    # -- replace periods, commas and runs of spaces with a single space, remove leading/trailing spaces,
+    #    and make everything lower case
+    names = pc.utf8_lower(pc.utf8_trim(pc.replace_substring_regex(names, MANUFACTURER_SEPARATORS_PATTERN, " "), " "))
 
-        # -- remove leading/trailing spaces and replace multiple spaces with a single space
-        df[col] = df[col].str.strip()
-        df[col] = df[col].str.replace(r'\s+', ' ', regex=True)
+    # remove all misspellings
+    corrections = _get_manufacturer_corrections()
+    misspellings = pa.array(list(corrections.keys()), type=pa.string())
+    correct_names = pa.array(list(corrections.values()), type=pa.string())
+    names = pc.coalesce(pc.take(correct_names, pc.index_in(names, value_set=misspellings)), names)
 
-        # -- make everything lower case
-        df[col] = df[col].str.lower()
+    # capitalize the first letter in every word
+    names = pc.utf8_title(names)
 
-        # remove all misspellings
-        mfg_name_map = load_config(common.config, "manufacturer_name_map.json")["manufacturer_map"]
-        for correct_name, misspellings in mfg_name_map.items():
-            df.loc[df[col].isin(misspellings), col] = correct_name
+    # re-capitalize all words that are 3 or fewer letters
+    return [' '.join(word.upper() if (len(word) <= 3 and word not in do_not_capitalize) else word for word in x.split())
+            for x in names.to_pylist()]
 
-        # capitalize the first letter in every word
-        df[col] = df[col].str.title()
 
-        # re-capitalize all words that are 3 or fewer letters
-        df[col] = df[col].apply(lambda x: ' '.join(word.upper() if (len(word) <= 3 and word not in do_not_capitalize) else word for word in x.split()))
+def clean_and_resolve_manufacturers(df: DataFrame) -> DataFrame:
+    """
+    Cleans and resolves data in the "manufacturer" column of a DataFrame. Adjusts the values in the manufacturer column by
+    appropriately considering custom manufacturer values and predefined mappings for misspellings.
 
-    # resolve multiple manufacturer columns
-    # -- put custom_manufacturer value in manufacturer if "Not Specified"
-    df.loc[df["manufacturer"] == "Not Specified", "manufacturer"] = df["custom_manufacturer"]
+    Manufacturer names repeat heavily, so the columns are converted to categoricals and only the distinct names are
+    cleaned. The columns are resolved on categorical codes and returned as strings.
 
-    # -- put vsi_mfr value in manufacturer if "Not Specified" (which happens if custom_manufacturer was not specified)
-    df.loc[df["manufacturer"] == "Not Specified", "manufacturer"] = df["vsi_mfr"]
+    Args:
+        df (DataFrame): Input DataFrame containing a "manufacturer" column and related columns ("custom_manufacturer"
+            and "vsi_mfr") to resolve manufacturer data.
+
+    Returns:
+        DataFrame: The DataFrame with cleaned and resolved manufacturer data in the "manufacturer" column.
+    """
+
+    # nothing to resolve (and no need to load the manufacturer map) in an empty frame
+    if df.empty:
+        return df
+
+    # Clean up manufacturer columns
+    columns = ["manufacturer", "custom_manufacturer", "vsi_mfr"]
+    for col in columns:
+        values = df[col].astype('category')
+
+        # clean each distinct name once; missing values (code -1) become "Not Specified", added as the last name
+        names = values.cat.categories.tolist() + ["Not Specified"]
+        codes = values.cat.codes.to_numpy()
+        codes = np.where(codes == -1, len(names) - 1, codes)
+
+        # several names can clean to the same name, so re-factorize the cleaned names and remap the row codes
+        name_codes, cleaned_names = factorize(np.array(_clean_manufacturer_names(names), dtype=object))
+        df[col] = Categorical.from_codes(name_codes[codes], categories=cleaned_names)
+
+    # give the columns the same categories so that their codes can be compared and combined directly
+    categories = union_categoricals([df[col].array for col in columns]).categories
+    for col in columns:
+        df[col] = df[col].cat.set_categories(categories)
+
+    # resolve multiple manufacturer columns in a single pass over the codes
+    # -- use custom_manufacturer if manufacturer is "Not Specified", and vsi_mfr if custom_manufacturer is too
+    not_specified = categories.get_loc("Not Specified")
+    manufacturer, custom_manufacturer, vsi_mfr = (df[col].cat.codes.to_numpy() for col in columns)
+    resolved = np.where(manufacturer != not_specified, manufacturer,
+                        np.where(custom_manufacturer != not_specified, custom_manufacturer, vsi_mfr))
+    df["manufacturer"] = Categorical.from_codes(resolved, categories=categories)
+
+    # return plain strings: the categories include names that never survive resolution, and categorical columns
+    # would be persisted as such and change groupby results for consumers on pandas 2 (observed=False)
+    for col in columns:
+        df[col] = df[col].astype('string')
 
     return df
 
@@ -205,8 +318,8 @@ def filter_by_date_range(df: DataFrame, start_date: str, end_date: str) -> DataF
         within the specified date range.
     """
 
-    # remove all rows outside the date range
-    df = df[(df["created_date"] >= start_date) & (df["created_date"] <= end_date)]
+    # remove all rows outside the date range; the bounds are parsed once so the datetime comparison stays vectorized
+    df = df[df["created_date"].between(Timestamp(start_date), Timestamp(end_date), inclusive="both")]
 
     return df
 
@@ -226,14 +339,17 @@ def clean_dataframe(df: DataFrame, table_name: str) -> DataFrame:
         the defined rules.
     """
 
+    # an empty frame has nothing to clean, but still return it with the columns of a cleaned one
+    if df.empty:
+        return drop_dataframe_columns(df, table_name)
+
     # move any valid manufacturer into the manufacturer field from custom or vsi fields
     df = clean_and_resolve_manufacturers(df)
 
-    # remove df with item_names that start with "Inactivated"
-    df = df[~df["item_name"].str.startswith("Inactivated")]
-
-    # remove df with item_names that contain the word "custom"
-    df = df[~df["item_name"].str.contains(r'\bcustom\b', case=False, regex=True)]
+    # remove df with item_names that start with "Inactivated" or contain the word "custom" (in a single slice)
+    item_names = df["item_name"].str
+    keep = ~item_names.startswith("Inactivated", na=False) & ~item_names.contains(_CUSTOM_ITEM_RE, na=False)
+    df = df.loc[keep]
 
     # round floats to two decimals
     df = round_float_columns(df)
@@ -242,8 +358,10 @@ def clean_dataframe(df: DataFrame, table_name: str) -> DataFrame:
     df = drop_dataframe_columns(df, table_name)
     
     # change sign on quantity for future calculations (it's -1 because it is moving out of inventory)
+    # negate with the ufunc directly; the column is not flipped in place because with copy-on-write its buffer may be
+    # shared with the caller's frame (and to_numpy() returns a read-only view)
     if table_name == "line_item":
-        df["quantity"] = df["quantity"] * -1
+        df["quantity"] = np.negative(df["quantity"])
         
     return df
 
@@ -270,11 +388,19 @@ def set_subsidiary_by_location(df: DataFrame, location_map: dict, null_value: st
             based on the location-to-subsidiary mapping.
     """
 
+    # code the locations against the map's keys (plus the null placeholder) so both the null check and the lookup
+    # are integer operations; code -1 (unmapped) and the appended placeholder both pick the trailing NaN
+    categories = list(location_map)
+    if null_value not in location_map:
+        categories.append(null_value)
+    codes = Categorical(df["location"], categories=categories).codes
+    subsidiaries = np.array([*location_map.values(), np.nan], dtype=object)
+
     # Replace subsidiary_name only if location is not "Not Specified"
     df["subsidiary_name"] = where(
-        df["location"] == null_value,
+        codes == categories.index(null_value),
         df["subsidiary_name"],
-        df["location"].map(location_map)
+        subsidiaries.take(codes)
     )
 
     return df
@@ -4,43 +4,52 @@ This module provides shared functions that repair NetSuite field types and value
 
 ### IMPORTS ###
 # standard libraries
-from typing import Union
 from unittest import case
 
 # data manipulation and validation
 import pandas as pd
 pd.set_option("future.no_silent_downcasting", True)
-from pandas._libs.tslibs.np_datetime import OutOfBoundsDatetime
 import common.utils.data_validation as dv
 
 
 # delegating to each module to simplify __init__.py
 __all__ = [
-    "safe_date_parse",
     "convert_json_strings_to_python_types",
     "repair_dataframe_data",
     "smart_fillna",
 ]
 
 
+### CONSTANTS ###
+# NetSuite boolean strings; pandas considers any non-empty string as True, so 'T' and 'F' would both become True
+_BOOL_MAP = {"T": True, "F": False, "True": True, "False": False}
+
+
 # FUNCTIONS
-def safe_date_parse(date_str: str) -> Union[pd.Timestamp, pd.NaT]:
+def _parse_dates(values: pd.Series) -> pd.Series:
     """
-    Parses a date string into a pandas Timestamp object. If the date string is out of bounds
-    or cannot be converted into a valid Timestamp, it returns pandas.NaT.
-
-    Args:
-        date_str (str): The date string to parse.
+    Parses a column of date strings, turning dates outside the datetime64[ns] range (e.g., 1/1/3032) into NaT.
 
-    Returns:
-        Union[pd.Timestamp, pd.NaT]: The parsed Timestamp object or pandas.NaT if parsing fails.
+    The column is parsed in the format inferred from its first date, and any dates in another format are parsed
+    again one by one. Strings that still cannot be parsed become NaT and are reported, so they are not silently
+    replaced by the null substitute. Dates with a time zone (e.g., 2024-03-05T10:00:00Z) are converted to UTC and
+    made naive, like the datetime64[ns] columns they go into.
     """
-    try:
-        ts = pd.to_datetime(date_str)
-    except OutOfBoundsDatetime:
-        ts = pd.NaT
+    dates = pd.to_datetime(values, errors="coerce", utc=True)
+
+    # values that are neither null nor "null" but did not match the inferred format
+    failed = dates.isna() & values.notna() & ~values.isin(["null"])
+    if failed.any():
+        dates[failed] = pd.to_datetime(values[failed], errors="coerce", format="mixed", utc=True)
 
-    return ts
+        # out-of-range dates only land here on pandas 2, which cannot parse them at all
+        unparsed = values[failed & dates.isna()]
+        if not unparsed.empty:
+            print(f"Warning: {len(unparsed)} unparseable dates in {values.name} set to null, "
+                  f"e.g. {unparsed.unique()[:5].tolist()}")
+
+    dates = dates.dt.tz_localize(None)
+    return dates.where(dates.between(pd.Timestamp.min, pd.Timestamp.max))
 
 
 def convert_json_strings_to_python_types(df: pd.DataFrame, field_map: dict) -> pd.DataFrame:
@@ -59,8 +68,8 @@ def convert_json_strings_to_python_types(df: pd.DataFrame, field_map: dict) -> p
         pd.DataFrame: A new DataFrame where the specified JSON string fields are converted to the
         desired Python types.
     """
-    # copy original
-    df = df.copy()
+    # copy original; a shallow copy is enough since the converted fields are replaced, not written into
+    df = df.copy(deep=False)
 
     # convert all fields
     for type_name, type_info in field_map.items():
@@ -68,22 +77,30 @@ def convert_json_strings_to_python_types(df: pd.DataFrame, field_map: dict) -> p
         fields = type_info['fields']
         null_substitute = type_info['null_substitute']
 
-        # there are some bad dates in some tables (e.g., 1/1/3032) that raise a pandas error, so need to deal with them
+        # work on the fields of this type as one block and write them back to df once
+        block = df[fields]
+
+        # there are some bad dates in some tables (e.g., 1/1/3032) that raise a pandas error, so turn them into NaT
+        # (and on to the null substitute below) value by value, parsing each column in one vectorized call
         if type_name == "datetime64[ns]":
-            df[fields] = df[fields].apply(safe_date_parse)
+            block = block.apply(_parse_dates)
 
         # also need to handle booleans because pandas considers any non-empty string as True, so 'T' and 'F' both
         # evaluate to True
         if type_name == "bool":
-            bool_map = {"T": True, "F": False, "True": True, "False": False}
-
             # apply the map; entries not in the dict become NaN
-            df[fields] = df[fields].replace(bool_map)
+            block = block.replace(_BOOL_MAP)
 
-        # Replace string "null" with a substitute value and convert type
-        df[fields] = df[fields].replace('null', null_substitute)
-        df[fields] = df[fields].fillna(null_substitute)
-        df[fields] = df[fields].astype(type_name)
+        # Replace string "null" and nulls with a substitute value in a single pass and convert type
+        missing = block.isna()
+        if type_name != "datetime64[ns]":
+            # (parsed dates can no longer hold the string "null")
+            missing |= block == 'null'
+        if missing.to_numpy().any():
+            block = block.mask(missing, null_substitute)
+
+        # only cast the fields that are not already the target type
+        df[fields] = block.astype({field: type_name for field, dtype in block.dtypes.items() if str(dtype) != type_name})
 
     return df
 
@@ -137,23 +154,29 @@ def smart_fillna(df: pd.DataFrame) -> pd.DataFrame:
         pd.DataFrame: DataFrame with missing values filled accordingly.
     """
 
-    df = df.copy()
+    # group the columns that need filling by the kind of fill value (not the value itself, since 0 == False)
+    columns_by_fill = {}
+    for col, dtype in df.dtypes[df.isna().any().to_numpy()].items():
+        match dtype:
+            case "datetime64[ns]":
+                columns_by_fill.setdefault("datetime", []).append(col)
+
+            case "string" | "object":
+                columns_by_fill.setdefault("string", []).append(col)
 
-    for col in df.columns:
-        count = df[col].isna().sum()
-        if count:
-            cur_type = df[col].dtype
-            match cur_type:
-                case "datetime64[ns]":
-                    df[col] = df[col].fillna(pd.Timestamp("1800-01-01"))
+            case "int64" | "float64":
+                columns_by_fill.setdefault("number", []).append(col)
 
-                case "string" | "object":
-                    df[col] = df[col].fillna("Not Specified").astype('string')
+            case "bool":
+                columns_by_fill.setdefault("bool", []).append(col)
 
-                case "int64" | "float64":
-                    df[col] = df[col].fillna(df[col].fillna(0))
+    # a shallow copy leaves the original unchanged since the filled columns are replaced, not written into
+    df = df.copy(deep=False)
 
-                case "bool":
-                    df[col] = df[col].fillna(False)
+    # fill each group as one sub-frame with a scalar, rather than column by column
+    fill_values = {"datetime": pd.Timestamp("1800-01-01"), "string": "Not Specified", "number": 0, "bool": False}
+    for fill, cols in columns_by_fill.items():
+        filled = df[cols].fillna(fill_values[fill])
+        df[cols] = filled.astype('string') if fill == "string" else filled
 
-    return df
\ No newline at end of file
+    return df
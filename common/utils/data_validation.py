@@ -4,10 +4,9 @@ This module contains shared data validation functions.
 
 # IMPORTS
 # Standard libraries
-from typing import Any, List
+from typing import List
 
 # Data analysis libraries
-import numpy as np
 import pandas as pd
 from pandas.api import types as ptypes
 
@@ -43,42 +42,35 @@ def validate_dataframe_data(df: pd.DataFrame) -> List[str]:
     mapping = df.dtypes.to_dict()
     invalid_columns = []
 
+    # Find the columns with null values in a single reduction over the whole frame
+    null_columns = set(df.columns[df.isna().any().to_numpy()])
+
     # Validate each column against its expected type
     for col, exp_dtype in mapping.items():
 
-        # Get column data
-        series = df[col]
-
         # Check for null values
-        if series.isna().any():
+        if col in null_columns:
             print(f"Column '{col}' contains null values.")
             invalid_columns.append(col)
             continue
 
-        def _matches(val: Any) -> bool:
-            """Helper function to check if value matches expected type"""
-            # Handle float type validation
-            if ptypes.is_float_dtype(exp_dtype):
-                return isinstance(val, (float, np.floating))
-            # Handle integer type validation
-            if ptypes.is_integer_dtype(exp_dtype):
-                return isinstance(val, (int, np.integer))
-            # Handle datetime type validation
-            if ptypes.is_datetime64_any_dtype(exp_dtype):
-                return isinstance(val, (pd.Timestamp, np.datetime64))
-            # Handle string type validation
-            if ptypes.is_string_dtype(exp_dtype):
-                return isinstance(val, str)
-            return True  # No strict check for other dtypes
-
-        # Validate each value in the column matches the expected type
-        for idx, val in series.items():
-            if not _matches(val):
-                print(
-                    f"Column '{col}', index {idx}: expected {exp_dtype}, "
-                    f"got {val!r} ({type(val)})"
-                )
-                invalid_columns.append(col)
-                break
+        # numeric, datetime and string dtypes can only hold values of their own type, so only object columns
+        # (which are checked for strings) need their values inspected; infer_dtype scans them in C
+        if exp_dtype != object:
+            continue
+
+        # Get column data
+        series = df[col]
+        if ptypes.infer_dtype(series, skipna=False) in ("string", "empty"):
+            continue
+
+        # report the first value that is not a string
+        position = (~series.map(lambda v: isinstance(v, str)).to_numpy(dtype=bool)).argmax()
+        val = series.iloc[position]
+        print(
+            f"Column '{col}', index {series.index[position]}: expected {exp_dtype}, "
+            f"got {val!r} ({type(val)})"
+        )
+        invalid_columns.append(col)
 
     return invalid_columns
\ No newline at end of file
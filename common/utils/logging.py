@@ -3,7 +3,11 @@ This module provides shared logging functions.
 """
 
 ### IMPORTS ###
+import atexit
 import logging
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
 
 
 # delegating to each module to simplify __init__.py
@@ -13,9 +17,17 @@ __all__ = [
 
 
 ### FUNCTIONS ###
+@lru_cache(maxsize=None)
 def create_logger(logger_name: str, log_level: int = logging.INFO, base_dir: str = "./logs") -> logging.Logger:
     """
-    Creates a logger object for logging messages to a file.
+    Creates a logger object for logging messages to a file. Results are cached per
+    (logger_name, log_level, base_dir), so repeated calls return the configured logger
+    without going back through the logging framework.
+
+    Records are handed to a background QueueListener that owns the FileHandler, so the
+    calling thread only enqueues them and never waits on disk I/O. Each logger has its own
+    queue and listener so records still land in that logger's file. Listeners are flushed
+    and stopped at interpreter exit.
 
     Args:
         logger_name (str): The name of the logger.
@@ -40,6 +52,11 @@ def create_logger(logger_name: str, log_level: int = logging.INFO, base_dir: str
         file_handler.setLevel(log_level)
         file_handler.setFormatter(formatter)
 
-        logger.addHandler(file_handler)
+        log_queue = SimpleQueue()
+        listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+        listener.start()
+        atexit.register(listener.stop)
+
+        logger.addHandler(QueueHandler(log_queue))
 
     return logger
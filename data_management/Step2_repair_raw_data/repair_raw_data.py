@@ -88,11 +88,13 @@ def main() -> None:
                 transactions = repair_dataframe_data(transactions, "cust_facing_transaction", table_fields_map)
                 line_items = repair_dataframe_data(line_items, "cust_facing_line_item", table_fields_map)
 
+                # store transactions in date order so the created_date row group statistics are tight, letting the
+                # date-range filters in Step3 skip whole row groups of out-of-range transactions
+                transactions = transactions.sort_values("created_date", kind="stable", ignore_index=True)
+
                 print(f"Saving repaired {raw_data_table} transaction and line item data...")
-                adl.save_df_as_parquet_in_data_lake(transactions, file_system_client, "raw/netsuite",
-                                                    f"transaction/{raw_data_table}_repaired.parquet")
-                adl.save_df_as_parquet_in_data_lake(line_items, file_system_client, "raw/netsuite",
-                                                    f"transaction/{raw_data_table}ItemLineItems_repaired.parquet")
+                adl.save_transactions_and_line_items(transactions, line_items, file_system_client, "raw/netsuite",
+                                                     raw_data_table, "repaired")
 
             case raw_data_table if raw_data_table in purchase_orders:
                 print(f"Retrieving raw {raw_data_table} transaction and line item data...")
@@ -103,11 +105,13 @@ def main() -> None:
                 transactions = repair_dataframe_data(transactions, raw_data_table, table_fields_map)
                 line_items = repair_dataframe_data(line_items, f"{raw_data_table}_li", table_fields_map)
 
+                # store transactions in date order so the created_date row group statistics are tight, letting the
+                # date-range filters in Step3 skip whole row groups of out-of-range transactions
+                transactions = transactions.sort_values("created_date", kind="stable", ignore_index=True)
+
                 print(f"Saving repaired {raw_data_table} transaction and line item data...")
-                adl.save_df_as_parquet_in_data_lake(transactions, file_system_client, "raw/netsuite",
-                                                    f"transaction/{raw_data_table}_repaired.parquet")
-                adl.save_df_as_parquet_in_data_lake(line_items, file_system_client, "raw/netsuite",
-                                                    f"transaction/{raw_data_table}ItemLineItems_repaired.parquet")
+                adl.save_transactions_and_line_items(transactions, line_items, file_system_client, "raw/netsuite",
+                                                     raw_data_table, "repaired")
 
             
 if __name__ == "__main__":
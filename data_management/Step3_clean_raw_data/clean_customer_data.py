@@ -1,14 +1,17 @@
 # IMPORTS
 # Standard libraries
 import datetime
+import concurrent.futures as cf
+from typing import Iterable
 
 # Azure Data Lake libraries
 import common.utils.azure_data_lake_interface as adl
 
 # data cleaning libraries
-from common.utils.data_cleansing import drop_dataframe_columns
+from common.utils.data_cleansing import drop_dataframe_columns, get_columns_to_drop
 
 # Data analysis libraries
+import numpy as np
 import pandas as pd
 
 # config
@@ -17,33 +20,7 @@ from common.utils.configuration_management import load_config
 
 
 # FUNCTIONS
-def filter_trans_dataframe(df, start_date, end_date):
-    """
-    Filters a DataFrame to include rows with dates within the specified range.
-
-    This function takes a DataFrame containing a 'created_date' column and filters its rows
-    to include only those with 'created_date' values between the `start_date` and `end_date`,
-    inclusive. The returned DataFrame will have the same structure as the input DataFrame
-    but may have fewer rows.
-
-    Args:
-        df: A pandas DataFrame to be filtered. It should contain a 'created_date' column
-            with datetime-compatible values.
-        start_date: The starting date of the range, inclusive.
-        end_date: The ending date of the range, inclusive.
-
-    Returns:
-        A pandas DataFrame containing rows from the input DataFrame where the 'created_date'
-        is within the specified date range.
-    """
-
-    # Filter to the specified date range
-    df = df[(df['created_date'] >= start_date) & (df['created_date'] <= end_date)]
-
-    return df
-
-
-def clean_and_filter_customer_data(customers: pd.DataFrame, active_cust_ids: set,
+def clean_and_filter_customer_data(customers: pd.DataFrame, active_cust_ids: Iterable,
                                    default_str_for_na: str = "Not Specified") -> pd.DataFrame:
     """
     Cleans and filters customer data by applying specific rules to the input DataFrame,
@@ -54,8 +31,8 @@ def clean_and_filter_customer_data(customers: pd.DataFrame, active_cust_ids: set
     Args:
         customers (pd.DataFrame): The input DataFrame containing customer data, including 'id',
             'primary_sales_rep', and 'ai_sales_rep' columns.
-        active_cust_ids (set): A set of customer IDs that are considered active and will
-            be retained in the filtered DataFrame.
+        active_cust_ids (Iterable): The customer IDs that are considered active and will
+            be retained in the filtered DataFrame (e.g., a set or the array from Series.unique()).
         default_str_for_na (str, optional): The default placeholder for missing or
             unspecified string values. Defaults to "Not Specified".
 
@@ -68,11 +45,21 @@ def clean_and_filter_customer_data(customers: pd.DataFrame, active_cust_ids: set
 
     # if either primary sales rep or ai sales rep is not null, set the value of new column 'sales_rep' to
     # the non-null value, but if they are both non null and don't match, set to 'Multiple'
-    active_customers['sales_rep'] = default_str_for_na
-    active_customers['sales_rep'] = active_customers['sales_rep'].astype("string")
-    active_customers.loc[(active_customers['primary_sales_rep'] != default_str_for_na) & (active_customers['ai_sales_rep'] == default_str_for_na), 'sales_rep'] = active_customers['primary_sales_rep']
-    active_customers.loc[(active_customers['primary_sales_rep'] == default_str_for_na) & (active_customers['ai_sales_rep'] != default_str_for_na), 'sales_rep'] = active_customers['ai_sales_rep']
-    active_customers.loc[(active_customers['primary_sales_rep'] != default_str_for_na) & (active_customers['ai_sales_rep'] != default_str_for_na) & (active_customers['primary_sales_rep'] != active_customers['ai_sales_rep']), 'sales_rep'] = 'Multiple'
+    # (one np.select over the two columns; missing values compare as False, as they do in a .loc mask)
+    primary = active_customers['primary_sales_rep']
+    ai = active_customers['ai_sales_rep']
+    has_primary = (primary != default_str_for_na).to_numpy(dtype=bool, na_value=False)
+    has_ai = (ai != default_str_for_na).to_numpy(dtype=bool, na_value=False)
+    no_primary = (primary == default_str_for_na).to_numpy(dtype=bool, na_value=False)
+    no_ai = (ai == default_str_for_na).to_numpy(dtype=bool, na_value=False)
+    differ = (primary != ai).to_numpy(dtype=bool, na_value=False)
+
+    sales_rep = np.select(
+        [has_primary & no_ai, no_primary & has_ai, has_primary & has_ai & differ],
+        [primary.to_numpy(dtype=object), ai.to_numpy(dtype=object), 'Multiple'],
+        default=default_str_for_na
+    )
+    active_customers['sales_rep'] = pd.array(sales_rep, dtype="string")
 
     # rename id to customer_id so it can be joined more easily with transaction data
     active_customers.rename(columns={'id': 'customer_id'}, inplace=True)
@@ -94,32 +81,39 @@ def main():
     container_name = "consolidated"
     file_system_client = adl.get_azure_file_system_client(service_client, container_name)
 
-    # get customer data
-    print("Getting customer data...")
     source_folder = "raw/netsuite"
-    customers = adl.get_parquet_file_from_data_lake(file_system_client, source_folder, "customer_repaired.parquet")
-
-    # get transaction data
-    print("Getting estimates...")
-    estimates = adl.get_parquet_file_from_data_lake(file_system_client, source_folder,"transaction/Estimate_repaired.parquet")
-    print("Getting sales orders...")
-    sales_orders = adl.get_parquet_file_from_data_lake(file_system_client, source_folder,"transaction/SalesOrd_repaired.parquet")
-    print("Getting invoices...")
-    invoices = adl.get_parquet_file_from_data_lake(file_system_client, source_folder,"transaction/CustInvc_repaired.parquet")
-
-    # clean and filter all transactions
-    print("Cleaning and filtering all tranactions...")
+
+    # set date range
     start_date = '2022-01-01'
     end_date = datetime.date.today().strftime('%Y-%m-%d')
-
-    estimates = filter_trans_dataframe(estimates, start_date, end_date)
-    sales_orders = filter_trans_dataframe(sales_orders, start_date, end_date)
-    invoices = filter_trans_dataframe(invoices, start_date, end_date)
-
-    # combine customer ids in transaction to id active customers
-    active_customer_ids = set(estimates["customer_id"].unique()).union(
-        sales_orders["customer_id"].unique(), invoices["customer_id"].unique()
-    )
+    date_filters = [("created_date", ">=", pd.Timestamp(start_date)), ("created_date", "<=", pd.Timestamp(end_date))]
+
+    # the four files are independent, so download and decode them concurrently
+    print("Getting customer data, estimates, sales orders and invoices...")
+    with cf.ThreadPoolExecutor(max_workers=4) as executor:
+        # unused columns are not read at all, except the sales rep fields that cleaning combines before dropping them
+        customers_future = executor.submit(
+            adl.get_parquet_file_from_data_lake, file_system_client, source_folder, "customer_repaired.parquet",
+            exclude_columns=get_columns_to_drop("customer") - {"primary_sales_rep", "ai_sales_rep"})
+
+        # only the customer ids of the transactions in the date range are needed
+        estimates_future, sales_orders_future, invoices_future = (
+            executor.submit(adl.get_parquet_file_from_data_lake, file_system_client, source_folder,
+                            f"transaction/{trans_type}_repaired.parquet", filters=date_filters,
+                            columns=["customer_id"])
+            for trans_type in ["Estimate", "SalesOrd", "CustInvc"]
+        )
+
+        customers = customers_future.result()
+        estimates = estimates_future.result()
+        sales_orders = sales_orders_future.result()
+        invoices = invoices_future.result()
+
+    # combine customer ids in transaction to id active customers; the ids stay in a NumPy array de-duplicated by
+    # pandas' hash table rather than going through a Python set
+    active_customer_ids = pd.concat(
+        [estimates["customer_id"], sales_orders["customer_id"], invoices["customer_id"]], ignore_index=True
+    ).unique()
 
     print("Cleaning customer data...")
     active_customers = clean_and_filter_customer_data(customers, active_customer_ids)
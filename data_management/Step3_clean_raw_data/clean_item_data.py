@@ -3,7 +3,7 @@
 import common.utils.azure_data_lake_interface as adl
 
 # data cleaning libraries
-from common.utils.data_cleansing import clean_dataframe
+from common.utils.data_cleansing import clean_dataframe, get_columns_to_drop
 
 # config
 import common.config
@@ -19,7 +19,10 @@ def main():
     file_system_client = adl.get_azure_file_system_client(service_client, "consolidated")
 
     print("Retrieving repaired item data...")
-    items = adl.get_parquet_file_from_data_lake(file_system_client, "raw/netsuite", "item_repaired.parquet")
+    # unused columns are not read at all, except the manufacturer fields that cleaning resolves before dropping them
+    items = adl.get_parquet_file_from_data_lake(file_system_client, "raw/netsuite", "item_repaired.parquet",
+                                                exclude_columns=get_columns_to_drop("item") - {"custom_manufacturer",
+                                                                                             "vsi_mfr"})
 
     print("Cleaning repaired item data...")
     items = clean_dataframe(items, "item")
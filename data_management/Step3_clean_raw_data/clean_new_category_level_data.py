@@ -13,14 +13,6 @@ from common.utils.configuration_management import load_config
 # MAIN
 def main():
 
-    # read spreadsheet from Rick Chadha
-    print("Reading Excel spreadsheet with new category level data...")
-    new_item_categories = read_excel(f'data_management/client_data/NewItemLevels.xlsx')
-
-    # make sure everything is interpreted as a string
-    print("Converting and renaming categories...")
-    new_item_categories = new_item_categories.astype('string')
-
     # rename columns to match NetSuite naming convention
     renames = {
         'Internal ID': 'sku',
@@ -35,9 +27,16 @@ def main():
         'Name': 'item_name',
         'Description': 'description',
     }
+
+    # read spreadsheet from Rick Chadha, parsing only the needed columns and interpreting everything as a string
+    print("Reading Excel spreadsheet with new category level data...")
+    new_item_categories = read_excel(f'data_management/client_data/NewItemLevels.xlsx', usecols=list(renames),
+                                     dtype='string')
+
+    print("Renaming categories...")
     new_item_categories.rename(columns=renames, inplace=True)
 
-    # drop unneeded columns
+    # put the columns in the order above (usecols keeps the spreadsheet's order)
     new_cols = list(renames.values())
     new_item_categories = new_item_categories[new_cols]
 
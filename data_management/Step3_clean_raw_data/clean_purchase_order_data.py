@@ -2,12 +2,13 @@
 
 # Standard libraries
 import datetime
+import concurrent.futures as cf
 
 # Azure Data Lake libraries
 import common.utils.azure_data_lake_interface as adl
 
 # data cleaning
-from common.utils.data_cleansing import drop_dataframe_columns, round_float_columns
+from common.utils.data_cleansing import drop_dataframe_columns, round_float_columns, get_columns_to_drop, filter_by_date_range
 
 # Data analysis libraries
 import pandas as pd
@@ -39,7 +40,7 @@ def clean_and_filter_purchase_orders(transactions: pd.DataFrame, start_date: str
     """
 
     # remove all transactions outside the date range
-    transactions = transactions[(transactions["created_date"] >= start_date) & (transactions["created_date"] <= end_date)]
+    transactions = filter_by_date_range(transactions, start_date, end_date)
 
     # most columns in the transactions don't make sense for purchase orders, so drop them
     transactions = drop_dataframe_columns(transactions, "po")
@@ -69,10 +70,15 @@ def clean_po_line_items(line_items: pd.DataFrame) -> pd.DataFrame:
     # drop unneeded columns
     line_items = drop_dataframe_columns(line_items, "po_line_item")
 
-    # drop item types that are not related to products/services
+    # drop item types that are not related to products/services (item_type is read as a categorical, so this only
+    # checks its handful of categories)
     drop_list = ["Description", "Markup", "Other Charge", "Payment", "Discount"]
     line_items = line_items[~line_items["item_type"].isin(drop_list)]
 
+    # item_type goes back to its string dtype so the cleaned files keep the same schema
+    line_items = line_items.assign(
+        item_type=lambda d: d["item_type"].astype(d["item_type"].cat.categories.dtype))
+
     # round floats to two decimals
     line_items = round_float_columns(line_items)
 
@@ -88,17 +94,26 @@ def main():
     service_client = adl.get_azure_service_client(config["blob_url"])
     file_system_client = adl.get_azure_file_system_client(service_client, "consolidated")
 
-    # get transaction-level and line item data
-    print("Getting purchase order data...")
-    trans_type = "PurchOrd"
-    transactions = adl.get_parquet_file_from_data_lake(file_system_client, "raw/netsuite",
-                                                       f"transaction/{trans_type}_repaired.parquet")
-    line_items = adl.get_parquet_file_from_data_lake(file_system_client, "raw/netsuite",
-                                                     f"transaction/{trans_type}ItemLineItems_repaired.parquet")
-
     start_date = "2021-01-01" # keep 1 year extra for lookback window
     end_date = datetime.date.today().strftime("%Y-%m-%d")
 
+    # get transaction-level and line item data concurrently, skipping transactions outside the date range and unused
+    # columns as the files are read
+    print("Getting purchase order data...")
+    trans_type = "PurchOrd"
+    with cf.ThreadPoolExecutor(max_workers=2) as executor:
+        transactions_future = executor.submit(adl.get_parquet_file_from_data_lake, file_system_client, "raw/netsuite",
+                                              f"transaction/{trans_type}_repaired.parquet",
+                                              filters=[("created_date", ">=", pd.Timestamp(start_date)),
+                                                       ("created_date", "<=", pd.Timestamp(end_date))],
+                                              exclude_columns=get_columns_to_drop("po"))
+        line_items_future = executor.submit(adl.get_parquet_file_from_data_lake, file_system_client, "raw/netsuite",
+                                            f"transaction/{trans_type}ItemLineItems_repaired.parquet",
+                                            exclude_columns=get_columns_to_drop("po_line_item"),
+                                            read_dictionary=["item_type"])
+        transactions = transactions_future.result()
+        line_items = line_items_future.result()
+
     print("Cleaning purchase order transaction data...")
     transactions = clean_and_filter_purchase_orders(transactions, start_date, end_date)
 
@@ -107,10 +122,8 @@ def main():
 
     # save in data lake
     print("Saving cleaned purchase order data in data lake...")
-    adl.save_df_as_parquet_in_data_lake(transactions, file_system_client, "cleaned/netsuite",
-                                        f"transaction/{trans_type}_cleaned.parquet")
-    adl.save_df_as_parquet_in_data_lake(line_items, file_system_client, "cleaned/netsuite",
-                                        f"transaction/{trans_type}ItemLineItems_cleaned.parquet")
+    adl.save_transactions_and_line_items(transactions, line_items, file_system_client, "cleaned/netsuite",
+                                         trans_type, "cleaned")
 
 
 if __name__ == "__main__":
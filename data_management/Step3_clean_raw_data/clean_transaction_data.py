@@ -1,15 +1,18 @@
 # Standard libraries
 import datetime
 import argparse
+import concurrent.futures as cf
+from typing import Tuple
 
 # Azure Data Lake libraries
 import common.utils.azure_data_lake_interface as adl
 
 # data cleaning libraries
-from common.utils.data_cleansing import round_float_columns, drop_dataframe_columns, clean_dataframe
+from common.utils.data_cleansing import (round_float_columns, drop_dataframe_columns, clean_dataframe, get_columns_to_drop,
+                                         filter_by_date_range)
 
 # Data analysis libraries
-from pandas import DataFrame
+from pandas import DataFrame, Timestamp
 
 # config
 import common.config
@@ -36,7 +39,7 @@ def clean_and_filter_transactions(df: DataFrame, start_date: str, end_date: str)
     """
     
     # remove all transactions outside the date range
-    df = df[(df["created_date"] >= start_date) & (df["created_date"] <= end_date)]
+    df = filter_by_date_range(df, start_date, end_date)
     
     # drop columns
     df = drop_dataframe_columns(df, "transaction")
@@ -64,11 +67,17 @@ def clean_and_filter_line_items(df: DataFrame) -> DataFrame:
     """
 
     # drop line_items with both cost and unit_price <= 0
-    df = df.query('quote_po_rate > 0 or unit_price > 0')
-    
-    # drop item types that are not related to products/services
+    # (a plain mask; query would parse the expression and go through pandas.eval on every call)
+    keep = (df['quote_po_rate'] > 0).to_numpy(dtype=bool, na_value=False) | \
+           (df['unit_price'] > 0).to_numpy(dtype=bool, na_value=False)
+
+    # drop item types that are not related to products/services (item_type is read as a categorical, so this only
+    # checks its handful of categories); both filters are combined so the frame is sliced once
     drop_list = ["Description", "Markup", "Other Charge", "Payment", "Discount"]
-    df = df[~df["item_type"].isin(drop_list)]
+    keep &= ~df["item_type"].isin(drop_list).to_numpy()
+
+    # item_type goes back to its string dtype so the cleaned files keep the same schema
+    df = df[keep].assign(item_type=lambda d: d["item_type"].astype(d["item_type"].cat.categories.dtype))
 
     # finish cleaning
     df = clean_dataframe(df, "line_item")
@@ -76,6 +85,78 @@ def clean_and_filter_line_items(df: DataFrame) -> DataFrame:
     return df
 
 
+def clean_transactions_and_line_items(transactions: DataFrame, line_items: DataFrame, item_mfrs: DataFrame,
+                                      start_date: str, end_date: str) -> Tuple[DataFrame, DataFrame]:
+    """
+    Cleans and filters the repaired transactions and line items of one transaction type.
+
+    Args:
+        transactions (DataFrame): The repaired transactions.
+        line_items (DataFrame): The repaired line items of those transactions.
+        item_mfrs (DataFrame): The item master's 'vsi_mfr' column indexed by 'sku'.
+        start_date (str): The starting date in the format 'YYYY-MM-DD' to include transactions from.
+        end_date (str): The ending date in the format 'YYYY-MM-DD' to include transactions up to.
+
+    Returns:
+        Tuple[DataFrame, DataFrame]: The cleaned transactions and line items.
+    """
+
+    # add vsi_mfr field to line df so that the manufacturer field can be resolved and cleaned
+    line_items = line_items.join(item_mfrs, how='left', on='sku').reset_index(drop=True)
+    line_items['vsi_mfr'] = line_items['vsi_mfr'].fillna('Not Specified')
+
+    # item_type is a handful of values repeated on every row, so its filter runs on categorical codes; line items
+    # read by process_transaction_type already arrive that way, repaired ones passed straight in do not
+    line_items['item_type'] = line_items['item_type'].astype('category')
+
+    transactions = clean_and_filter_transactions(transactions, start_date, end_date)
+    line_items = clean_and_filter_line_items(line_items)
+
+    return transactions, line_items
+
+
+def process_transaction_type(file_system_client, trans_type: str, item_mfrs: DataFrame, start_date: str,
+                             end_date: str) -> None:
+    """
+    Gets the repaired transactions and line items of one transaction type from the data lake, cleans and filters
+    them, and saves the results back in the data lake.
+
+    Args:
+        file_system_client: DataLakeFileSystemClient for the "consolidated" container.
+        trans_type (str): The transaction type to process ('Estimate', 'SalesOrd' or 'CustInvc').
+        item_mfrs (DataFrame): The item master's 'vsi_mfr' column indexed by 'sku'.
+        start_date (str): The starting date in the format 'YYYY-MM-DD' to include transactions from.
+        end_date (str): The ending date in the format 'YYYY-MM-DD' to include transactions up to.
+    """
+
+    # transactions outside the date range are skipped as each file is read
+    date_filters = [("created_date", ">=", Timestamp(start_date)), ("created_date", "<=", Timestamp(end_date))]
+
+    # unused columns are not read at all, except the manufacturer fields that cleaning resolves before dropping them
+    line_item_read_drops = get_columns_to_drop("line_item") - {"custom_manufacturer", "vsi_mfr"}
+
+    # transactions and line items are independent downloads, so fetch them concurrently
+    print(f"Getting {trans_type} transactions and line items from data lake...")
+    with cf.ThreadPoolExecutor(max_workers=2) as executor:
+        transactions_future = executor.submit(adl.get_parquet_file_from_data_lake, file_system_client, "raw/netsuite",
+                                              f"transaction/{trans_type}_repaired.parquet",
+                                              filters=date_filters,
+                                              exclude_columns=get_columns_to_drop("transaction"))
+        line_items_future = executor.submit(adl.get_parquet_file_from_data_lake, file_system_client, "raw/netsuite",
+                                            f"transaction/{trans_type}ItemLineItems_repaired.parquet",
+                                            exclude_columns=line_item_read_drops, read_dictionary=["item_type"])
+        transactions = transactions_future.result()
+        line_items = line_items_future.result()
+
+    print(f"Cleaning and filtering {trans_type} transactions and line items...")
+    transactions, line_items = clean_transactions_and_line_items(transactions, line_items, item_mfrs, start_date,
+                                                                 end_date)
+
+    print(f"\rSaving cleaned and filtered {trans_type} transactions and line items in data lake...")
+    adl.save_transactions_and_line_items(transactions, line_items, file_system_client, "cleaned/netsuite",
+                                         trans_type, "cleaned")
+
+
 # MAIN
 def main() -> None:
     """
@@ -105,7 +186,9 @@ def main() -> None:
 
     print("Getting item master from data lake...")
     items = adl.get_parquet_file_from_data_lake(file_system_client, "raw/netsuite",
-                                                       "item_repaired.parquet")
+                                                       "item_repaired.parquet", columns=["sku", "vsi_mfr"])
+    # index the manufacturer lookup by sku once so each transaction type joins against the same hashed index
+    item_mfrs = items.set_index('sku')[['vsi_mfr']]
     
     # set date range
     start_date = "2022-01-01"
@@ -114,28 +197,16 @@ def main() -> None:
     # Define transaction types
     transaction_types = ["Estimate", "SalesOrd", "CustInvc"]
 
-    # get transaction-level and line item data
+    # get, clean and save each transaction type in its own thread; the time is spent on data lake transfers and
+    # pyarrow decoding, which release the GIL
     trans_types_to_process = [args.trans_type] if args.trans_type else transaction_types
-    for trans_type in trans_types_to_process:
-        print(f"Getting {trans_type} transactions and line items from data lake...")
-        transactions = adl.get_parquet_file_from_data_lake(file_system_client, "raw/netsuite",
-                                                    f"transaction/{trans_type}_repaired.parquet")
-        line_items = adl.get_parquet_file_from_data_lake(file_system_client, "raw/netsuite",
-                                                 f"transaction/{trans_type}ItemLineItems_repaired.parquet")
-
-        # add vsi_mfr field to line df so that the manufacturer field can be resolved and cleaned
-        line_items = line_items.merge(items[['sku', 'vsi_mfr']], how='left', on='sku')
-        line_items['vsi_mfr'] = line_items['vsi_mfr'].fillna('Not Specified')
-
-        print(f"Cleaning and filtering {trans_type} transactions and line items...")
-        transactions = clean_and_filter_transactions(transactions, start_date, end_date)
-        line_items = clean_and_filter_line_items(line_items)
-
-        print(f"\rSaving cleaned and filtered {trans_type} transactions and line items in data lake...")
-        adl.save_df_as_parquet_in_data_lake(transactions, file_system_client, "cleaned/netsuite",
-                                            f"transaction/{trans_type}_cleaned.parquet")
-        adl.save_df_as_parquet_in_data_lake(line_items, file_system_client, "cleaned/netsuite",
-                                            f"transaction/{trans_type}ItemLineItems_cleaned.parquet")
+    with cf.ThreadPoolExecutor(max_workers=len(trans_types_to_process)) as executor:
+        futures = [executor.submit(process_transaction_type, file_system_client, trans_type, item_mfrs, start_date,
+                                   end_date) for trans_type in trans_types_to_process]
+
+        # re-raise the first failure, if any
+        for future in futures:
+            future.result()
 
 
 if __name__ == "__main__":
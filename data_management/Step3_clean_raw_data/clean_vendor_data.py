@@ -3,7 +3,7 @@
 import common.utils.azure_data_lake_interface as adl
 
 # data cleaning libraries
-from common.utils.data_cleansing import drop_dataframe_columns
+from common.utils.data_cleansing import drop_dataframe_columns, get_columns_to_drop
 
 # config
 import common.config
@@ -24,7 +24,8 @@ def main():
     # get customer data
     print("Getting vendor data...")
     source_folder = "raw/netsuite"
-    df = adl.get_parquet_file_from_data_lake(file_system_client, source_folder, "vendor_repaired.parquet")
+    df = adl.get_parquet_file_from_data_lake(file_system_client, source_folder, "vendor_repaired.parquet",
+                                             exclude_columns=get_columns_to_drop("vendor"))
 
     print("Cleaning vendor data...")
     # drop columns that are not used
@@ -0,0 +1,99 @@
+# IMPORTS
+# Standard libraries
+import datetime
+import argparse
+import concurrent.futures as cf
+
+# Azure Data Lake libraries
+import common.utils.azure_data_lake_interface as adl
+
+# data repair and cleaning libraries
+from common.utils.data_repair import repair_dataframe_data
+from clean_transaction_data import clean_transactions_and_line_items
+
+# config
+import common.config
+from common.utils.configuration_management import load_config
+
+
+# MAIN
+def main() -> None:
+    """
+    Repairs and cleans customer-facing transaction data in a single pass, for routine pipeline runs. This does the
+    work of repair_raw_data.py followed by clean_transaction_data.py, but the repaired DataFrames are cleaned in
+    memory instead of being read back from the data lake.
+
+    The repaired files are still saved (in the background, while cleaning runs) because other Step3 scripts, such as
+    clean_customer_data.py, read them. The item master must already have been repaired. The separate Step2 and Step3
+    scripts remain for debugging a single stage.
+
+    Args:
+        --trans-type (str): Transaction type to process. Possible values are 'Estimate',
+                            'SalesOrd', or 'CustInvc'. If not specified, all transaction types
+                            will be processed.
+
+    Raises:
+        SystemExit: Raised if invalid command-line arguments are passed.
+        dv.ValidationError: If repaired data fails validation.
+    """
+
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(description='Repair and clean transaction data.')
+    parser.add_argument('--trans-type', type=str, choices=['Estimate', 'SalesOrd', 'CustInvc'],
+                        help='Transaction type to process. If not specified, all types will be processed.')
+    args = parser.parse_args()
+
+    print("Attaching to data lake...")
+    config = load_config(common.config, "datalake_config.json")
+    service_client = adl.get_azure_service_client(config["blob_url"])
+    file_system_client = adl.get_azure_file_system_client(service_client, "consolidated")
+
+    # read field map
+    table_fields_map = load_config(common.config, "table_field_types.json")
+
+    print("Getting item master from data lake...")
+    items = adl.get_parquet_file_from_data_lake(file_system_client, "raw/netsuite", "item_repaired.parquet",
+                                                columns=["sku", "vsi_mfr"])
+    item_mfrs = items.set_index('sku')[['vsi_mfr']]
+
+    # set date range
+    start_date = "2022-01-01"
+    end_date = datetime.date.today().strftime("%Y-%m-%d")
+
+    trans_types_to_process = [args.trans_type] if args.trans_type else ["Estimate", "SalesOrd", "CustInvc"]
+    with cf.ThreadPoolExecutor(max_workers=1) as upload_executor:
+        repaired_uploads = []
+
+        for trans_type in trans_types_to_process:
+            print(f"Retrieving raw {trans_type} transaction and line item data...")
+            transactions, line_items = adl.get_transactions_and_line_items(file_system_client, trans_type)
+
+            # since transactions are the same, using a shared JSON field map
+            print(f"Repairing {trans_type} transaction and line item data...")
+            transactions = repair_dataframe_data(transactions, "cust_facing_transaction", table_fields_map)
+            line_items = repair_dataframe_data(line_items, "cust_facing_line_item", table_fields_map)
+
+            # store transactions in date order, as repair_raw_data.py does, so the Step3 date-range filters can skip
+            # whole row groups
+            transactions = transactions.sort_values("created_date", kind="stable", ignore_index=True)
+
+            # upload the repaired data while it is cleaned (cleaning returns new frames, so these are not modified)
+            repaired_uploads.append(upload_executor.submit(
+                adl.save_transactions_and_line_items, transactions, line_items, file_system_client, "raw/netsuite",
+                trans_type, "repaired"))
+
+            print(f"Cleaning and filtering {trans_type} transactions and line items...")
+            transactions, line_items = clean_transactions_and_line_items(transactions, line_items, item_mfrs,
+                                                                         start_date, end_date)
+
+            print(f"Saving cleaned and filtered {trans_type} transactions and line items in data lake...")
+            adl.save_transactions_and_line_items(transactions, line_items, file_system_client, "cleaned/netsuite",
+                                                 trans_type, "cleaned")
+
+        # re-raise the first failed repaired upload, if any
+        for upload in repaired_uploads:
+            upload.result()
+
+
+if __name__ == "__main__":
+    main()
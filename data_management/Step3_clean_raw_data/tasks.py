@@ -1,10 +1,6 @@
 # tasks.py
 from invoke import task
 
-@task
-def stage1(c):
-    c.run("python3 clean_customer_data.py")
-
 @task
 def stage2(c):
     c.run("python3 clean_item_data.py")
@@ -13,9 +9,16 @@ def stage2(c):
 def stage3(c):
     c.run("python3 clean_vendor_data.py")
 
+# repairs and cleans the customer-facing transactions in one pass (Step2 only needs to repair PurchOrd and the
+# other tables); clean_transaction_data.py remains for re-cleaning already repaired files
 @task(pre=[stage2])
 def stage4(c):
-    c.run("python3 clean_transaction_data.py")
+    c.run("python3 repair_and_clean_transaction_data.py")
+
+# customer cleaning reads the repaired transactions to find active customers, so it runs after stage4 writes them
+@task(pre=[stage4])
+def stage1(c):
+    c.run("python3 clean_customer_data.py")
 
 @task(pre=[stage1, stage2, stage3, stage4])
 def all(c):
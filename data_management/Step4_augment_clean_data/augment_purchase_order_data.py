@@ -3,7 +3,7 @@
 import common.utils.azure_data_lake_interface as adl
 
 # data augmentation libraries
-from common.utils.data_augmentation import add_new_category_levels, add_vsi_item_category
+from common.utils.data_augmentation import add_item_master_fields, LEVEL_COLUMNS
 
 # Data analysis libraries
 from pandas import DataFrame, Timestamp
@@ -22,11 +22,8 @@ def augment_po_line_items(line_items: DataFrame, transactions: DataFrame, items:
     line_items = line_items.merge(transactions[["tranid", "created_date"]], on="tranid", how="left")
     line_items["created_date"] = line_items["created_date"].fillna(Timestamp("1800-01-01"))
 
-    # update/add category level info
-    line_items = add_new_category_levels(line_items, items)
-
-    # add vsi_category
-    line_items = add_vsi_item_category(line_items, items)
+    # update/add category level info and vsi_category
+    line_items = add_item_master_fields(line_items, items)
 
     # add vendor information to line_items after changing col name
     vendors.rename(columns={"id": "vendor_id"}, inplace=True)
@@ -50,13 +47,17 @@ def main():
     trans_type = "PurchOrd"
     data_state = "cleaned"
     transactions = adl.get_parquet_file_from_data_lake(file_system_client, f"{data_state}/netsuite",
-                                                       f"transaction/{trans_type}_{data_state}.parquet")
+                                                       f"transaction/{trans_type}_{data_state}.parquet",
+                                                       columns=["tranid", "created_date"])
     line_items = adl.get_parquet_file_from_data_lake(file_system_client, f"{data_state}/netsuite",
                                                      f"transaction/{trans_type}ItemLineItems_{data_state}.parquet")
 
+    # only the columns the augmentation joins in are read from the lookups
     print("Getting vendor and item master data...")
-    vendors = adl.get_parquet_file_from_data_lake(file_system_client, "cleaned/netsuite", "vendor_cleaned.parquet")
-    items = adl.get_parquet_file_from_data_lake(file_system_client, "enhanced/netsuite", "item_enhanced.parquet")
+    vendors = adl.get_parquet_file_from_data_lake(file_system_client, "cleaned/netsuite", "vendor_cleaned.parquet",
+                                                  columns=["id", "company_name", "category"])
+    items = adl.get_parquet_file_from_data_lake(file_system_client, "enhanced/netsuite", "item_enhanced.parquet",
+                                                columns=["sku", *LEVEL_COLUMNS, "vsi_item_category"])
 
     print("Enhancing purchase order line item data...")
     line_items = augment_po_line_items(line_items, transactions, items, vendors)
@@ -1,7 +1,8 @@
 # Standard libraries
 import datetime
 import argparse
-from typing import Literal
+import concurrent.futures as cf
+from typing import Dict, Literal, Optional, Tuple
 
 # Azure Data Lake libraries
 import common.utils.azure_data_lake_interface as adl
@@ -11,10 +12,11 @@ from common.utils.data_repair import smart_fillna
 from common.utils.data_cleansing import round_float_columns, set_subsidiary_by_location
 
 # data augmentation libraries
-from common.utils.data_augmentation import add_new_category_levels, add_vsi_item_category
+from common.utils.data_augmentation import add_item_master_fields, LEVEL_COLUMNS
 
 # Data analysis libraries
-from pandas import DataFrame, Timestamp, to_datetime, merge_asof
+import numpy as np
+from pandas import DataFrame, Timestamp, concat, to_datetime, merge_asof
 
 # config
 import common.config
@@ -94,53 +96,81 @@ def augment_transactions(df: DataFrame, customer_df: DataFrame, location_map: di
 
 def get_highest_recent_prices(
     line_items: DataFrame,
-    purchase_orders: DataFrame,
+    price_sources: Dict[str, Tuple[DataFrame, str]],
     sku_col: str = 'sku',
     date_col: str = 'created_date',
-    price_col: str = 'unit_price',
     window: Literal['365D'] = '365D',
-    output_col: str = 'highest_recent_cost'
+    max_col: Optional[str] = None
 ) -> DataFrame:
-    """Annotate each line-item with the max purchase price for the same SKU over
-    the window ending at its created_date.
+    """Annotate each line-item with the max price for the same SKU over the window
+    ending at its created_date, for each of several price sources.
+
+    All sources are combined into one per-SKU table of rolling maxima, so the line
+    items are sorted and as-of merged once however many sources there are.
 
     Args:
         line_items: DataFrame with [sku_col, date_col].
-        purchase_orders: DataFrame with [sku_col, date_col, price_col].
+        price_sources: maps each output column name to a (DataFrame, price column)
+            pair; each DataFrame has [sku_col, date_col, price column].
         sku_col: column name for SKU.
         date_col: column name for the date.
-        price_col: column name for purchase price.
         window: rolling window length (e.g. '365D').
-        output_col: name of the output column.
+        max_col: if given, also add this column holding the row-wise max of the
+            output columns (ignoring NaN).
 
     Returns:
-        A copy of `line_items` with an extra `output_col`.
+        A copy of `line_items` with an extra column per price source (and `max_col`).
     """
     # ---- 1) Prep and sort ----
-    li = line_items.copy()
-    po = purchase_orders.copy()
-    li[date_col] = to_datetime(li[date_col])
-    po[date_col] = to_datetime(po[date_col])
-
-    li['_orig_idx'] = li.index
-    li_sorted = li.sort_values(date_col)
-
-    po_sorted = po.sort_values([sku_col, date_col])
-
-    # ---- 2) Compute exact 365-day rolling max per PO date ----
+    # only the key and price columns take part in the rolling max and the as-of merge, so the (wide) frames are
+    # never copied, sorted or merged as a whole
+    li_keys = DataFrame({
+        sku_col: line_items[sku_col].reset_index(drop=True),
+        date_col: to_datetime(line_items[date_col]).reset_index(drop=True),
+        '_pos': np.arange(len(line_items)),
+    })
+    li_sorted = li_keys.sort_values(date_col)
+
+    # ---- 2) Compute exact rolling max per price date, for each source ----
+    rolling_maxes = []
+    for output_col, (prices, price_col) in price_sources.items():
+        po = DataFrame({
+            sku_col: prices[sku_col],
+            date_col: to_datetime(prices[date_col]),
+            price_col: prices[price_col],
+        })
+        po_sorted = po.sort_values([sku_col, date_col])
+
+        rolling_maxes.append(
+            po_sorted
+              .set_index(date_col)
+              .groupby(sku_col)[price_col]
+              .rolling(window)
+              .max()
+              # rows sharing a date end with the same window, so the last (and largest) of them is the one that counts
+              .groupby(level=[sku_col, date_col])
+              .max()
+              # -inf marks windows with no prices, so the forward fill below only fills dates missing from this source
+              .fillna(-np.inf)
+              .rename(output_col)
+        )
+
+    # ---- 3) Combine the sources into one table ----
+    # one row per (sku, date) seen in any source; each column carries its source's latest rolling max forward, so
+    # the as-of match below picks up every source's value at or before the line item date
+    output_cols = list(price_sources)
     rolling = (
-        po_sorted
-          .set_index(date_col)
-          .groupby(sku_col)[price_col]
-          .rolling(window)
-          .max()
+        concat(rolling_maxes, axis=1)
+          .sort_index()
+          .groupby(level=sku_col)
+          .ffill()
+          .replace(-np.inf, np.nan)
           .reset_index()
-          .rename(columns={price_col: output_col})
     )
     # ensure sorted by date for merge_asof
-    rolling.sort_values(date_col, inplace=True)
+    rolling.sort_values(date_col, inplace=True, kind='stable')
 
-    # ---- 3) As-of merge onto line df ----
+    # ---- 4) As-of merge onto the line item keys ----
     merged = merge_asof(
         li_sorted,
         rolling,
@@ -149,13 +179,17 @@ def get_highest_recent_prices(
         direction='backward'
     )
 
-    # ---- 4) Restore original order ----
-    result = (
-        merged
-          .sort_values('_orig_idx')
-          .drop(columns=['_orig_idx'])
-          .reset_index(drop=True)
-    )
+    # ---- 5) Scatter the maxima back into the original row order ----
+    positions = merged['_pos'].to_numpy()
+    result = line_items.reset_index(drop=True)
+    result[date_col] = li_keys[date_col]
+    for output_col in output_cols:
+        highest = np.empty(len(line_items), dtype=merged[output_col].dtype)
+        highest[positions] = merged[output_col].to_numpy()
+        result[output_col] = highest
+
+    if max_col is not None:
+        result[max_col] = np.fmax.reduce([result[col].to_numpy() for col in output_cols])
 
     return result
 
@@ -213,23 +247,33 @@ def augment_line_items(line_item_df: DataFrame,
     line_item_df.drop("commission_only", axis=1, inplace=True)
 
     # add category info and vsi_category
-    line_item_df = add_new_category_levels(line_item_df, item_master_df)
-    line_item_df = add_vsi_item_category(line_item_df, item_master_df)
+    line_item_df = add_item_master_fields(line_item_df, item_master_df)
 
     # calculate financial values for each line item
-    line_item_df["total_amount"] = line_item_df["quantity"] * line_item_df["unit_price"]
-    line_item_df["total_cost"] = line_item_df["quantity"] * line_item_df["quote_po_rate"]
-    line_item_df["gross_profit"] = line_item_df["total_amount"] - line_item_df["total_cost"]
-    line_item_df["gross_profit_percent"] = (line_item_df["gross_profit"] / line_item_df["total_amount"]) * 100
+    # (on the underlying arrays, so there is no index alignment and each result is written into a single buffer)
+    quantity = line_item_df["quantity"].to_numpy(dtype=np.float64, na_value=np.nan)
+    unit_price = line_item_df["unit_price"].to_numpy(dtype=np.float64, na_value=np.nan)
+    unit_cost = line_item_df["quote_po_rate"].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    total_amount = np.multiply(quantity, unit_price)
+    total_cost = np.multiply(quantity, unit_cost)
+    gross_profit = np.subtract(total_amount, total_cost)
+    with np.errstate(divide='ignore', invalid='ignore'):  # zero amounts give inf/NaN, as pandas division does
+        gross_profit_percent = np.divide(gross_profit, total_amount)
+    np.multiply(gross_profit_percent, 100, out=gross_profit_percent)
+
+    line_item_df["total_amount"] = total_amount
+    line_item_df["total_cost"] = total_cost
+    line_item_df["gross_profit"] = gross_profit
+    line_item_df["gross_profit_percent"] = gross_profit_percent
 
     # find the highest purchase cost and highest quoted cost for every item using
-    # purchase order and line item data over a 12-month rolling window
-    line_item_df = get_highest_recent_prices(line_item_df, purchase_order_df, output_col='highest_recent_cost')
-    line_item_df = get_highest_recent_prices(line_item_df, line_item_df,
-                                             price_col='quote_po_rate', output_col='highest_quoted_cost')
-
-    # create a highest_cost column by taking the max of the two cost columns
-    line_item_df['highest_cost'] = line_item_df[['highest_quoted_cost', 'highest_recent_cost']].max(axis=1)
+    # purchase order and line item data over a 12-month rolling window, and a highest_cost column holding the max
+    # of the two
+    line_item_df = get_highest_recent_prices(line_item_df,
+                                             {'highest_recent_cost': (purchase_order_df, 'unit_price'),
+                                              'highest_quoted_cost': (line_item_df, 'quote_po_rate')},
+                                             max_col='highest_cost')
 
     # round floats to two decimals again
     line_item_df = round_float_columns(line_item_df)
@@ -254,6 +298,35 @@ def augment_line_items(line_item_df: DataFrame,
     return line_item_df
 
 
+def process_transaction_type(file_system_client, trans_type: str, customers: DataFrame, items: DataFrame,
+                             po_lines: DataFrame, location_map: dict, start_date: str, end_date: str) -> None:
+    """
+    Gets the cleaned transactions and line items of one transaction type from the data lake, augments them, and
+    saves the results in the data lake. The shared DataFrames and location map are only read.
+
+    Args:
+        file_system_client: DataLakeFileSystemClient for the "consolidated" container.
+        trans_type (str): The transaction type to process ('Estimate', 'SalesOrd' or 'CustInvc').
+        customers (DataFrame): The cleaned customer data.
+        items (DataFrame): The enhanced item master.
+        po_lines (DataFrame): The enhanced purchase order line items.
+        location_map (dict): Dictionary mapping locations to subsidiaries.
+        start_date (str): The starting date filter for the line items' creation dates.
+        end_date (str): The ending date filter for the line items' creation dates.
+    """
+    print(f"Getting {trans_type} transactions and line items from data lake...")
+    transactions, line_items = adl.get_transactions_and_line_items(file_system_client, trans_type, "cleaned")
+
+    print(f"Augmenting {trans_type} transactions and line items...")
+    transactions = augment_transactions(transactions, customers, location_map)
+    line_items = augment_line_items(line_items, transactions, items, po_lines,
+                                    customers, location_map, start_date, end_date)
+
+    print(f"Saving augmented {trans_type} transactions and line items in data lake...")
+    adl.save_transactions_and_line_items(transactions, line_items, file_system_client, "enhanced/netsuite",
+                                         trans_type, "enhanced")
+
+
 # MAIN
 def main() -> None:
     """
@@ -281,15 +354,20 @@ def main() -> None:
     service_client = adl.get_azure_service_client(config["blob_url"])
     file_system_client = adl.get_azure_file_system_client(service_client, "consolidated")
 
+    # the shared lookups only read the columns the augmentation uses
     print(f"\rGetting customer data from data lake...")
-    customers = adl.get_parquet_file_from_data_lake(file_system_client, "cleaned/netsuite", "customer_cleaned.parquet")
+    customers = adl.get_parquet_file_from_data_lake(file_system_client, "cleaned/netsuite", "customer_cleaned.parquet",
+                                                    columns=["customer_id", "company_name", "subsidiary_name",
+                                                             "end_market", "sales_rep"])
 
     print(f"\rGetting item master data from data lake...")
-    items = adl.get_parquet_file_from_data_lake(file_system_client, "enhanced/netsuite", "item_enhanced.parquet")
+    items = adl.get_parquet_file_from_data_lake(file_system_client, "enhanced/netsuite", "item_enhanced.parquet",
+                                                columns=["sku", *LEVEL_COLUMNS, "vsi_item_category"])
 
     print(f"\rGetting purchase order data from data lake...")
     po_lines = adl.get_parquet_file_from_data_lake(file_system_client, "enhanced/netsuite",
-                                                   f"transaction/PurchOrdItemLineItems_enhanced.parquet")
+                                                   f"transaction/PurchOrdItemLineItems_enhanced.parquet",
+                                                   columns=["sku", "created_date", "unit_price"])
 
     # set date range
     start_date = "2022-01-01"
@@ -298,27 +376,18 @@ def main() -> None:
     # Define transaction types
     transaction_types = ["Estimate", "SalesOrd", "CustInvc"]
 
-    # get transaction-level and line item data
+    location_map = load_config(common.config, "location_subsidiary_map.json")["locations_subsidiary_map"]
+
+    # get, augment and save each transaction type in its own thread; the shared frames and map are only read
     trans_types_to_process = [args.trans_type] if args.trans_type else transaction_types
-    for trans_type in trans_types_to_process:
-        print(f"Getting {trans_type} transactions and line items from data lake...")
-        data_state = "cleaned"
-        transactions = adl.get_parquet_file_from_data_lake(file_system_client, f"{data_state}/netsuite",
-                                                           f"transaction/{trans_type}_{data_state}.parquet")
-        line_items = adl.get_parquet_file_from_data_lake(file_system_client, f"{data_state}/netsuite",
-                                                         f"transaction/{trans_type}ItemLineItems_{data_state}.parquet")
-
-        print(f"Augmenting {trans_type} transactions and line items...")
-        config = load_config(common.config, "location_subsidiary_map.json")
-        transactions = augment_transactions(transactions, customers, config["locations_subsidiary_map"])
-        line_items = augment_line_items(line_items, transactions,items, po_lines,
-                                        customers, config["locations_subsidiary_map"], start_date, end_date)
-
-        print(f"Saving augmented {trans_type} transactions and line items in data lake...")
-        adl.save_df_as_parquet_in_data_lake(transactions, file_system_client, "enhanced/netsuite",
-                                            f"transaction/{trans_type}_enhanced.parquet")
-        adl.save_df_as_parquet_in_data_lake(line_items, file_system_client, "enhanced/netsuite",
-                                            f"transaction/{trans_type}ItemLineItems_enhanced.parquet")
+    with cf.ThreadPoolExecutor(max_workers=len(trans_types_to_process)) as executor:
+        futures = [executor.submit(process_transaction_type, file_system_client, trans_type, customers, items,
+                                   po_lines, location_map, start_date, end_date)
+                   for trans_type in trans_types_to_process]
+
+        # re-raise the first failure, if any
+        for future in futures:
+            future.result()
 
 
 if __name__ == "__main__":
@@ -1,17 +1,14 @@
-# add path to custom python code for accessing data lake and working with dataframes
-import sys
-sys.path.append('/Users/markbills/Library/CloudStorage/OneDrive-Transformativ,LLC/Clients/Ovation Holdings/src')
-
 # IMPORT LIBRARIES
 # Azure Data Lake libraries
-import azure_data_lake_interface as adl
-
-# Helper function libraries
-import helper_functions as hf
+import common.utils.azure_data_lake_interface as adl
 
 # data analysis
 import pandas as pd
 
+# config
+import common.config
+from common.utils.configuration_management import load_config
+
 
 # DATA ENHANCEMENT FUNCTIONS
 def get_monthly_item_costs(df: pd.DataFrame) -> pd.DataFrame:
@@ -229,7 +226,7 @@ def combine_and_enhance_line_item_data(po_lines: pd.DataFrame,
 # LOAD DATA
 # attach to the data lake
 print("Attaching to data lake...")
-config = hf.load_config("config/datalake_config.json", flush_cache=True)
+config = load_config(common.config, "datalake_config.json")
 service_client = adl.get_azure_service_client(config["blob_url"])
 file_system_client = adl.get_azure_file_system_client(service_client, "consolidated")
 